@@ -26,14 +26,20 @@ def clear_all_data():
             print("Found tables:", tables)
             
             # Clear data from each table
+            cleared = []
             for table_name in tables:
-                if table_name not in ['alembic_version']:  # Skip migration table
+                # Skip the migration table, and keep the change counters so API ETags can't repeat
+                if table_name not in ['alembic_version', 'table_versions']:
                     conn.execute(text(f"TRUNCATE TABLE {table_name} RESTART IDENTITY CASCADE"))
+                    cleared.append(table_name)
                     print(f"Cleared data from table: {table_name}")
             
             # Commit changes
             conn.commit()
         
+        # Let API clients and caches see the tables changed
+        db.touch_tables(cleared)
+        
         print("\n✅ All data has been successfully cleared from the database!")
         print("The database structure remains intact.")
         return True
@@ -63,6 +69,8 @@ def clear_specific_table(table_name):
             conn.execute(text(f"TRUNCATE TABLE {table_name} RESTART IDENTITY CASCADE"))
             conn.commit()
         
+        if table_name != 'table_versions':
+            db.touch_tables({table_name})
         print(f"✅ Data cleared from table: {table_name}")
         return True
         
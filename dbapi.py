@@ -1,5 +1,5 @@
 # dbapi.py
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_swagger_ui import get_swaggerui_blueprint
 import datetime
@@ -8,6 +8,11 @@ import os
 import json
 from dotenv import load_dotenv
 import uuid
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 import requests
 import bcrypt
 import jwt
@@ -19,7 +24,7 @@ from twilio.rest import Client
 import datetime
 
 # Import PostgreSQL database manager
-from database_postgresql import db
+from database_postgresql import db, EXPORT_ENTITIES, TRACEABILITY_GAPS, FLAKY_LOOKBACK_DAYS, FLAKY_LAST_N, TRANSIT_ANOMALY_METRICS, TRANSIT_ANOMALY_ALPHA, TRANSIT_ANOMALY_Z, table_change_listeners, get_pool_status, parse_datetime, parse_date, test_run_content_hash, parse_summary_thresholds, Requirement, TestCase, TestRun, Defect, TestTypeSummary, TransitMetric, IngestBatch
 
 load_dotenv()
 
@@ -40,15 +45,13 @@ swaggerui_blueprint = get_swaggerui_blueprint(
 
 app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
 
-# Swagger JSON endpoint
-@app.route('/static/swagger.json')
-def create_swagger_spec():
-    """Generate Swagger specification"""
+def build_swagger_spec():
+    """Build the Swagger specification"""
     swagger_spec = {
         "openapi": "3.0.0",
         "info": {
             "title": "Reporting Application API",
-            "description": "REST API for Transit Management System Test Dashboard",
+            "description": "REST API for Transit Management System Test Dashboard. Collection GET endpoints return ETag and Last-Modified headers; send If-None-Match or If-Modified-Since to get 304 Not Modified while the underlying tables are unchanged",
             "version": "1.0.0",
             "contact": {
                 "name": "API Support",
@@ -69,7 +72,11 @@ def create_swagger_spec():
             "/api/v1/requirements": {
                 "get": {
                     "summary": "Get all requirements",
-                    "description": "Retrieve all requirements from the database",
+                    "description": "Retrieve all requirements from the database. Pass limit and/or cursor to get one keyset-paginated page instead of the full list",
+                    "parameters": [
+                        {"$ref": "#/components/parameters/Limit"},
+                        {"$ref": "#/components/parameters/Cursor"}
+                    ],
                     "responses": {
                         "200": {
                             "description": "Successful response",
@@ -151,7 +158,11 @@ def create_swagger_spec():
             "/api/v1/test-cases": {
                 "get": {
                     "summary": "Get all test cases",
-                    "description": "Retrieve all test cases from the database",
+                    "description": "Retrieve all test cases from the database. Pass limit and/or cursor to get one keyset-paginated page instead of the full list",
+                    "parameters": [
+                        {"$ref": "#/components/parameters/Limit"},
+                        {"$ref": "#/components/parameters/Cursor"}
+                    ],
                     "responses": {
                         "200": {
                             "description": "Successful response",
@@ -233,7 +244,17 @@ def create_swagger_spec():
             "/api/v1/test-runs": {
                 "get": {
                     "summary": "Get all test runs",
-                    "description": "Retrieve all test runs from the database",
+                    "description": "Retrieve all test runs from the database, optionally filtered. Pass limit and/or cursor to get one keyset-paginated page instead of the full list",
+                    "parameters": [
+                        {"name": "customerId", "in": "query", "required": False, "schema": {"type": "integer"}, "description": "Only runs for this customer"},
+                        {"name": "sourceSystem", "in": "query", "required": False, "schema": {"type": "string"}, "description": "Only runs from this source system"},
+                        {"name": "result", "in": "query", "required": False, "schema": {"type": "string"}, "description": "Only runs with this result (e.g. Pass, Fail)"},
+                        {"name": "testCaseId", "in": "query", "required": False, "schema": {"type": "string"}, "description": "Only runs of this test case"},
+                        {"name": "from", "in": "query", "required": False, "schema": {"type": "string", "format": "date-time"}, "description": "Earliest execution date (inclusive)"},
+                        {"name": "to", "in": "query", "required": False, "schema": {"type": "string", "format": "date-time"}, "description": "Latest execution date (inclusive); a date covers the whole day"},
+                        {"$ref": "#/components/parameters/Limit"},
+                        {"$ref": "#/components/parameters/Cursor"}
+                    ],
                     "responses": {
                         "200": {
                             "description": "Successful response",
@@ -283,7 +304,10 @@ def create_swagger_spec():
             "/api/v1/test-runs/bulk": {
                 "post": {
                     "summary": "Create multiple test runs",
-                    "description": "Create multiple test runs in the database",
+                    "description": "Create multiple test runs in the database; executions that are already recorded are reported as duplicates",
+                    "parameters": [
+                        {"$ref": "#/components/parameters/IdempotencyKey"}
+                    ],
                     "requestBody": {
                         "required": True,
                         "content": {
@@ -314,7 +338,11 @@ def create_swagger_spec():
             "/api/v1/defects": {
                 "get": {
                     "summary": "Get all defects",
-                    "description": "Retrieve all defects from the database",
+                    "description": "Retrieve all defects from the database. Pass limit and/or cursor to get one keyset-paginated page instead of the full list",
+                    "parameters": [
+                        {"$ref": "#/components/parameters/Limit"},
+                        {"$ref": "#/components/parameters/Cursor"}
+                    ],
                     "responses": {
                         "200": {
                             "description": "Successful response",
@@ -364,7 +392,11 @@ def create_swagger_spec():
             "/api/v1/test-type-summary": {
                 "get": {
                     "summary": "Get all test type summaries",
-                    "description": "Retrieve all test type summaries from the database",
+                    "description": "Retrieve all test type summaries from the database. Pass limit and/or cursor to get one keyset-paginated page instead of the full list",
+                    "parameters": [
+                        {"$ref": "#/components/parameters/Limit"},
+                        {"$ref": "#/components/parameters/Cursor"}
+                    ],
                     "responses": {
                         "200": {
                             "description": "Successful response",
@@ -411,10 +443,64 @@ def create_swagger_spec():
                     }
                 }
             },
+            "/api/v1/transit-metrics/series": {
+                "get": {
+                    "summary": "Transit metrics time series",
+                    "description": "Transit metrics aggregated per day, week (starting Monday) or month. Counts are summed, success rates weighted by gate/bus taps and the response time by total taps",
+                    "parameters": [
+                        {"name": "from", "in": "query", "required": False, "schema": {"type": "string", "format": "date"}, "description": "First day of the range (default: 89 days before 'to')"},
+                        {"$ref": "#/components/parameters/DayTo"},
+                        {"name": "bucket", "in": "query", "required": False, "schema": {"type": "string", "enum": ["day", "week", "month"], "default": "day"}}
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "One point per bucket that has data",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "from": {"type": "string", "format": "date"},
+                                            "to": {"type": "string", "format": "date"},
+                                            "bucket": {"type": "string"},
+                                            "items": {
+                                                "type": "array",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "bucket": {"type": "string", "format": "date"},
+                                                        "days": {"type": "integer"},
+                                                        "firstDate": {"type": "string", "format": "date"},
+                                                        "lastDate": {"type": "string", "format": "date"},
+                                                        "FVM_Transactions": {"type": "integer"},
+                                                        "Gate_Taps": {"type": "integer"},
+                                                        "Bus_Taps": {"type": "integer"},
+                                                        "Defect_Count": {"type": "integer"},
+                                                        "Success_Rate_Gate": {"type": "number"},
+                                                        "Success_Rate_Bus": {"type": "number"},
+                                                        "Avg_Response_Time": {"type": "number"}
+                                                    }
+                                                }
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        },
+                        "400": {
+                            "description": "Invalid date range or bucket"
+                        }
+                    }
+                }
+            },
             "/api/v1/transit-metrics": {
                 "get": {
                     "summary": "Get all transit metrics",
-                    "description": "Retrieve all transit metrics from the database",
+                    "description": "Retrieve all transit metrics from the database. Pass limit and/or cursor to get one keyset-paginated page instead of the full list",
+                    "parameters": [
+                        {"$ref": "#/components/parameters/Limit"},
+                        {"$ref": "#/components/parameters/Cursor"}
+                    ],
                     "responses": {
                         "200": {
                             "description": "Successful response",
@@ -461,10 +547,332 @@ def create_swagger_spec():
                     }
                 }
             },
+            "/api/v1/export/{entity}": {
+                "get": {
+                    "summary": "Export all rows of an entity",
+                    "description": "Stream the full history of an entity with constant server memory, newest first",
+                    "parameters": [
+                        {
+                            "name": "entity",
+                            "in": "path",
+                            "required": True,
+                            "schema": {
+                                "type": "string",
+                                "enum": ["requirements", "test-cases", "test-runs", "defects", "test-type-summary", "transit-metrics"]
+                            },
+                            "description": "Entity to export"
+                        },
+                        {
+                            "name": "format",
+                            "in": "query",
+                            "required": False,
+                            "schema": {
+                                "type": "string",
+                                "enum": ["ndjson", "json"],
+                                "default": "ndjson"
+                            },
+                            "description": "One JSON object per line (ndjson) or a single JSON array (json)"
+                        }
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "Streamed rows",
+                            "content": {
+                                "application/x-ndjson": {},
+                                "application/json": {}
+                            }
+                        },
+                        "404": {
+                            "description": "Unknown entity"
+                        }
+                    }
+                }
+            },
+            "/api/v1/traceability": {
+                "get": {
+                    "summary": "Requirement traceability coverage",
+                    "description": "Per-requirement test case count, latest run result, whether any run passed and open defect count (defects of its test cases not Closed/Resolved), newest requirement first, one keyset-paginated page at a time",
+                    "parameters": [
+                        {"$ref": "#/components/parameters/Limit"},
+                        {"$ref": "#/components/parameters/Cursor"},
+                        {"name": "component", "in": "query", "required": False, "schema": {"type": "string"}},
+                        {
+                            "name": "gap",
+                            "in": "query",
+                            "required": False,
+                            "schema": {"type": "string", "enum": ["no-test-cases", "no-passing-run", "open-defects"]},
+                            "description": "Only requirements with this coverage gap"
+                        }
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "One page of coverage rows",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "items": {"type": "array", "items": {"$ref": "#/components/schemas/RequirementCoverage"}},
+                                            "next_cursor": {"type": "string", "nullable": True}
+                                        }
+                                    }
+                                }
+                            }
+                        },
+                        "400": {
+                            "description": "Invalid limit, cursor or gap"
+                        }
+                    }
+                }
+            },
+            "/api/v1/analytics/test-type-trends": {
+                "get": {
+                    "summary": "Test type summary trends",
+                    "description": "Actual values of test type summaries, parsed into canonical units (ms, %, GB), aggregated per test type, metric and day/week/month. 'worst' is the maximum for upper-limit thresholds (<, <=) and the minimum for lower-limit ones (>, >=). evaluatedFailures counts rows whose actual value misses the expected threshold; statusMismatches counts rows whose reported status disagrees with that evaluation",
+                    "parameters": [
+                        {"name": "from", "in": "query", "required": False, "schema": {"type": "string", "format": "date"}, "description": "First day of the range (default: 89 days before 'to')"},
+                        {"$ref": "#/components/parameters/DayTo"},
+                        {"name": "bucket", "in": "query", "required": False, "schema": {"type": "string", "enum": ["day", "week", "month"], "default": "week"}},
+                        {"name": "testType", "in": "query", "required": False, "schema": {"type": "string"}}
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "One item per bucket, test type, metric and unit",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "from": {"type": "string", "format": "date"},
+                                            "to": {"type": "string", "format": "date"},
+                                            "bucket": {"type": "string"},
+                                            "items": {
+                                                "type": "array",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "bucket": {"type": "string", "format": "date"},
+                                                        "testType": {"type": "string"},
+                                                        "metrics": {"type": "string"},
+                                                        "unit": {"type": "string"},
+                                                        "samples": {"type": "integer"},
+                                                        "min": {"type": "number"},
+                                                        "max": {"type": "number"},
+                                                        "avg": {"type": "number"},
+                                                        "worst": {"type": "number", "nullable": True},
+                                                        "evaluatedFailures": {"type": "integer"},
+                                                        "reportedFailures": {"type": "integer"},
+                                                        "statusMismatches": {"type": "integer"}
+                                                    }
+                                                }
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        },
+                        "400": {
+                            "description": "Invalid date range or bucket"
+                        }
+                    }
+                }
+            },
+            "/api/v1/analytics/transit-anomalies": {
+                "get": {
+                    "summary": "Transit metric anomalies",
+                    "description": "Days whose gate_taps, success_rate_gate, success_rate_bus or avg_response_time deviated from the metric's EWMA baseline by at least TRANSIT_ANOMALY_Z standard deviations. Detection runs incrementally as transit metrics are ingested",
+                    "parameters": [
+                        {"name": "from", "in": "query", "required": False, "schema": {"type": "string", "format": "date"}, "description": "First day of the range (default: 89 days before 'to')"},
+                        {"$ref": "#/components/parameters/DayTo"},
+                        {"name": "metric", "in": "query", "required": False, "schema": {"type": "string", "enum": ["gate_taps", "success_rate_gate", "success_rate_bus", "avg_response_time"]}},
+                        {"name": "minZ", "in": "query", "required": False, "schema": {"type": "number"}, "description": "Only anomalies with at least this absolute z-score"}
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "Anomalies, most recent first",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "from": {"type": "string", "format": "date"},
+                                            "to": {"type": "string", "format": "date"},
+                                            "alpha": {"type": "number"},
+                                            "threshold": {"type": "number"},
+                                            "items": {
+                                                "type": "array",
+                                                "items": {"$ref": "#/components/schemas/TransitMetricAnomaly"}
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        },
+                        "400": {
+                            "description": "Invalid date range, metric or minZ"
+                        }
+                    }
+                }
+            },
+            "/api/v1/analytics/flaky": {
+                "get": {
+                    "summary": "Flaky test cases",
+                    "description": "Test cases whose decided (Pass/Fail) runs in the last FLAKY_LOOKBACK_DAYS days changed outcome, most flaky first: flip rate (outcome changes per consecutive pair of runs), pass ratio of the last FLAKY_LAST_N runs and the current streak. Stats are read from the per-test-case cache, which the ingest worker (or refresh_rollups.py flaky) recomputes after new runs arrive; stale counts the test cases not yet recomputed",
+                    "parameters": [
+                        {
+                            "name": "minFlipRate",
+                            "in": "query",
+                            "required": False,
+                            "schema": {"type": "number", "minimum": 0, "maximum": 1, "default": 0},
+                            "description": "Only test cases flipping at least this often"
+                        },
+                        {
+                            "name": "minRuns",
+                            "in": "query",
+                            "required": False,
+                            "schema": {"type": "integer", "minimum": 0, "default": 5},
+                            "description": "Ignore test cases with fewer decided runs in the window"
+                        },
+                        {"$ref": "#/components/parameters/Limit"}
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "Flaky test cases",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "lookbackDays": {"type": "integer"},
+                                            "lastN": {"type": "integer"},
+                                            "stale": {"type": "integer", "description": "Test cases with new runs not yet reflected in the stats"},
+                                            "items": {"type": "array", "items": {"$ref": "#/components/schemas/TestCaseFlakiness"}}
+                                        }
+                                    }
+                                }
+                            }
+                        },
+                        "400": {
+                            "description": "Invalid minFlipRate, minRuns or limit"
+                        }
+                    }
+                }
+            },
+            "/api/v1/analytics/defects": {
+                "get": {
+                    "summary": "Defect lifecycle metrics",
+                    "description": "Mean and median time to fix (hours) by severity and by component (through the defect's test case) for defects fixed in the range, weekly opened/fixed counts (weeks start on Monday), and current open defects (status not Closed/Resolved) bucketed by age and severity",
+                    "parameters": [
+                        {"name": "from", "in": "query", "required": False, "schema": {"type": "string", "format": "date"}, "description": "First day of the range (default: 83 days before 'to')"},
+                        {"$ref": "#/components/parameters/DayTo"}
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "Defect metrics",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "from": {"type": "string", "format": "date"},
+                                            "to": {"type": "string", "format": "date"},
+                                            "timeToFix": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "bySeverity": {"type": "array", "items": {"type": "object"}},
+                                                    "byComponent": {"type": "array", "items": {"type": "object"}}
+                                                }
+                                            },
+                                            "weekly": {
+                                                "type": "array",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "week": {"type": "string", "format": "date"},
+                                                        "opened": {"type": "integer"},
+                                                        "fixed": {"type": "integer"}
+                                                    }
+                                                }
+                                            },
+                                            "openAge": {
+                                                "type": "array",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "bucket": {"type": "string", "enum": ["0-7d", "7-30d", "30-90d", "90d+"]},
+                                                        "open": {"type": "integer"},
+                                                        "bySeverity": {"type": "object", "additionalProperties": {"type": "integer"}}
+                                                    }
+                                                }
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        },
+                        "400": {
+                            "description": "Invalid date range"
+                        }
+                    }
+                }
+            },
+            "/api/v1/analytics/pass-rate": {
+                "get": {
+                    "summary": "Daily pass-rate trends",
+                    "description": "Pass/fail counts, pass rate and p50/p95 observed time per day, customer and test case, read from the daily rollups (refreshed by refresh_rollups.py). With groupBy, counts are summed per day or component and percentiles are omitted. Pass rate excludes skipped runs",
+                    "parameters": [
+                        {"$ref": "#/components/parameters/DayFrom"},
+                        {"$ref": "#/components/parameters/DayTo"},
+                        {"name": "customerId", "in": "query", "required": False, "schema": {"type": "integer"}},
+                        {"name": "testCaseId", "in": "query", "required": False, "schema": {"type": "string"}},
+                        {"name": "component", "in": "query", "required": False, "schema": {"type": "string"}},
+                        {
+                            "name": "groupBy",
+                            "in": "query",
+                            "required": False,
+                            "schema": {"type": "string", "enum": ["day", "component"]},
+                            "description": "Sum the rollups per day or per component"
+                        }
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "Rollup rows for the range",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "from": {"type": "string", "format": "date"},
+                                            "to": {"type": "string", "format": "date"},
+                                            "groupBy": {"type": "string"},
+                                            "items": {"type": "array", "items": {"$ref": "#/components/schemas/PassRateRollup"}}
+                                        }
+                                    }
+                                }
+                            }
+                        },
+                        "400": {
+                            "description": "Invalid date, customerId or groupBy"
+                        }
+                    }
+                }
+            },
             "/api/v1/results": {
                 "post": {
                     "summary": "Unified bulk upload endpoint",
-                    "description": "Single endpoint to upload all types of data (requirements, test cases, test runs, defects, test type summaries, transit metrics). Automatically routes data to appropriate tables based on event kind.",
+                    "description": "Single endpoint to upload all types of data (requirements, test cases, test runs, defects, test type summaries, transit metrics). Automatically routes data to appropriate tables based on event kind. Test runs matching a stored run on test case, execution date, executedBy and result are reported as duplicates.",
+                    "parameters": [
+                        {"$ref": "#/components/parameters/IdempotencyKey"},
+                        {
+                            "name": "async",
+                            "in": "query",
+                            "required": False,
+                            "schema": {
+                                "type": "boolean"
+                            },
+                            "description": "Queue the upload and return 202 with a batch ID instead of processing it inline"
+                        }
+                    ],
                     "requestBody": {
                         "required": True,
                         "content": {
@@ -476,6 +884,9 @@ def create_swagger_spec():
                         }
                     },
                     "responses": {
+                        "202": {
+                            "description": "Upload queued (async=true); poll /api/v1/results/{batchId}"
+                        },
                         "200": {
                             "description": "Bulk upload completed successfully",
                             "content": {
@@ -487,7 +898,7 @@ def create_swagger_spec():
                             }
                         },
                         "400": {
-                            "description": "Bad request - invalid data or missing required fields"
+                            "description": "Bad request - invalid data or missing required fields; with async=true, also any event that cannot be processed (listed in items with its index)"
                         },
                         "500": {
                             "description": "Internal server error"
@@ -495,10 +906,35 @@ def create_swagger_spec():
                     }
                 }
             },
+            "/api/v1/results/{batchId}": {
+                "get": {
+                    "summary": "Get asynchronous upload status",
+                    "description": "Status of an upload queued with async=true. Once completed, includes the same accepted/duplicates/failed/items as a synchronous upload",
+                    "parameters": [
+                        {
+                            "name": "batchId",
+                            "in": "path",
+                            "required": True,
+                            "schema": {
+                                "type": "string"
+                            },
+                            "description": "Batch ID returned by the 202 response"
+                        }
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "Batch status (queued, processing, completed or failed)"
+                        },
+                        "404": {
+                            "description": "Batch not found"
+                        }
+                    }
+                }
+            },
             "/api/v1/results/test-runs": {
                 "post": {
                     "summary": "Bulk upload test run results",
-                    "description": "Upload multiple test run results in a single request",
+                    "description": "Upload multiple test run results in a single request. A run with the same test case, execution date, executedBy and result as a stored run is reported as a duplicate.",
                     "requestBody": {
                         "required": True,
                         "content": {
@@ -683,7 +1119,100 @@ def create_swagger_spec():
             }
         },
         "components": {
+            "parameters": {
+                "IdempotencyKey": {
+                    "name": "Idempotency-Key",
+                    "in": "header",
+                    "required": False,
+                    "schema": {"type": "string", "maxLength": 255},
+                    "description": "Client-chosen key; retries with the same key and body return the original response instead of storing the data again"
+                },
+                "Limit": {
+                    "name": "limit",
+                    "in": "query",
+                    "required": False,
+                    "schema": {"type": "integer", "minimum": 1, "maximum": 1000},
+                    "description": "Page size. When given, the response is {items, next_cursor} instead of a plain list"
+                },
+                "Cursor": {
+                    "name": "cursor",
+                    "in": "query",
+                    "required": False,
+                    "schema": {"type": "string"},
+                    "description": "next_cursor value from the previous page"
+                },
+                "DayFrom": {
+                    "name": "from",
+                    "in": "query",
+                    "required": False,
+                    "schema": {"type": "string", "format": "date"},
+                    "description": "First day of the range (default: 29 days before 'to')"
+                },
+                "DayTo": {
+                    "name": "to",
+                    "in": "query",
+                    "required": False,
+                    "schema": {"type": "string", "format": "date"},
+                    "description": "Last day of the range, inclusive (default: today)"
+                }
+            },
             "schemas": {
+                "TransitMetricAnomaly": {
+                    "type": "object",
+                    "properties": {
+                        "date": {"type": "string", "format": "date"},
+                        "metric": {"type": "string"},
+                        "value": {"type": "number"},
+                        "baseline": {"type": "number"},
+                        "stddev": {"type": "number"},
+                        "zScore": {"type": "number"},
+                        "direction": {"type": "string", "enum": ["above", "below"]}
+                    }
+                },
+                "TestCaseFlakiness": {
+                    "type": "object",
+                    "properties": {
+                        "testCaseId": {"type": "string"},
+                        "runs": {"type": "integer"},
+                        "flips": {"type": "integer"},
+                        "flipRate": {"type": "number"},
+                        "lastNRuns": {"type": "integer"},
+                        "lastNPasses": {"type": "integer"},
+                        "lastNPassRatio": {"type": "number", "nullable": True},
+                        "streakResult": {"type": "string", "enum": ["Pass", "Fail"]},
+                        "streakLength": {"type": "integer"},
+                        "lastRunAt": {"type": "string", "format": "date-time"}
+                    }
+                },
+                "RequirementCoverage": {
+                    "type": "object",
+                    "properties": {
+                        "requirementId": {"type": "string"},
+                        "title": {"type": "string"},
+                        "component": {"type": "string"},
+                        "status": {"type": "string"},
+                        "testCaseCount": {"type": "integer"},
+                        "latestRunResult": {"type": "string", "nullable": True},
+                        "latestRunAt": {"type": "string", "format": "date-time", "nullable": True},
+                        "hasPassingRun": {"type": "boolean"},
+                        "openDefectCount": {"type": "integer"}
+                    }
+                },
+                "PassRateRollup": {
+                    "type": "object",
+                    "properties": {
+                        "day": {"type": "string", "format": "date"},
+                        "customerId": {"type": "integer"},
+                        "testCaseId": {"type": "string"},
+                        "component": {"type": "string"},
+                        "runs": {"type": "integer"},
+                        "passes": {"type": "integer"},
+                        "fails": {"type": "integer"},
+                        "passRate": {"type": "number", "nullable": True},
+                        "observedTimeP50": {"type": "number", "nullable": True},
+                        "observedTimeP95": {"type": "number", "nullable": True}
+                    }
+                },
                 "Requirement": {
                     "type": "object",
                     "properties": {
@@ -746,8 +1275,11 @@ def create_swagger_spec():
                     "type": "object",
                     "properties": {
                         "run_id": {"type": "string"},
+                        "test_run_id": {"type": "string"},
+                        "customer_id": {"type": "integer"},
+                        "source_system": {"type": "string"},
                         "test_case_id": {"type": "string"},
-                        "execution_date": {"type": "string"},
+                        "execution_date": {"type": "string", "format": "date-time"},
                         "result": {"type": "string"},
                         "observed_time": {"type": "integer"},
                         "executed_by": {"type": "string"},
@@ -756,11 +1288,14 @@ def create_swagger_spec():
                 },
                 "TestRunRequest": {
                     "type": "object",
-                    "required": ["run_id", "test_case_id", "result"],
+                    "required": ["run_id", "customer_id", "source_system", "test_case_id", "result", "execution_date"],
                     "properties": {
                         "run_id": {"type": "string"},
+                        "test_run_id": {"type": "string", "description": "Generated when omitted"},
+                        "customer_id": {"type": "integer"},
+                        "source_system": {"type": "string"},
                         "test_case_id": {"type": "string"},
-                        "execution_date": {"type": "string"},
+                        "execution_date": {"type": "string", "format": "date-time"},
                         "result": {"type": "string"},
                         "observed_time": {"type": "integer"},
                         "executed_by": {"type": "string"},
@@ -782,6 +1317,7 @@ def create_swagger_spec():
                 },
                 "TestRunEvent": {
                     "type": "object",
+                    "required": ["testCase", "executionDate"],
                     "properties": {
                         "kind": {"type": "string"},
                         "testCase": {
@@ -862,7 +1398,13 @@ def create_swagger_spec():
                         "expected": {"type": "string"},
                         "actual": {"type": "string"},
                         "status": {"type": "string"},
-                        "test_date": {"type": "string"}
+                        "test_date": {"type": "string", "format": "date"},
+                        "expected_comparator": {"type": "string", "nullable": True, "readOnly": True},
+                        "expected_value": {"type": "number", "nullable": True, "readOnly": True},
+                        "expected_unit": {"type": "string", "nullable": True, "readOnly": True},
+                        "actual_value": {"type": "number", "nullable": True, "readOnly": True},
+                        "actual_unit": {"type": "string", "nullable": True, "readOnly": True},
+                        "evaluated_status": {"type": "string", "enum": ["Pass", "Fail"], "nullable": True, "readOnly": True}
                     }
                 },
                 "TestTypeSummaryRequest": {
@@ -874,14 +1416,14 @@ def create_swagger_spec():
                         "expected": {"type": "string"},
                         "actual": {"type": "string"},
                         "status": {"type": "string"},
-                        "test_date": {"type": "string"}
+                        "test_date": {"type": "string", "format": "date"}
                     }
                 },
                 "TransitMetric": {
                     "type": "object",
                     "properties": {
                         "id": {"type": "integer"},
-                        "date": {"type": "string"},
+                        "date": {"type": "string", "format": "date"},
                         "fvm_transactions": {"type": "integer"},
                         "gate_taps": {"type": "integer"},
                         "bus_taps": {"type": "integer"},
@@ -896,7 +1438,7 @@ def create_swagger_spec():
                     "type": "object",
                     "required": ["date"],
                     "properties": {
-                        "date": {"type": "string"},
+                        "date": {"type": "string", "format": "date"},
                         "fvm_transactions": {"type": "integer"},
                         "gate_taps": {"type": "integer"},
                         "bus_taps": {"type": "integer"},
@@ -917,7 +1459,7 @@ def create_swagger_spec():
                             "type": "array",
                             "items": {
                                 "type": "object",
-                                "required": ["kind", "testCase", "result"],
+                                "required": ["kind", "testCase", "result", "executionDate"],
                                 "properties": {
                                     "kind": {"type": "string", "enum": ["TEST_RUN"]},
                                     "testCase": {
@@ -1067,7 +1609,7 @@ def create_swagger_spec():
                                             "expected": {"type": "string"},
                                             "actual": {"type": "string"},
                                             "status": {"type": "string"},
-                                            "testDate": {"type": "string"}
+                                            "testDate": {"type": "string", "format": "date"}
                                         }
                                     }
                                 }
@@ -1092,7 +1634,7 @@ def create_swagger_spec():
                                         "type": "object",
                                         "required": ["date"],
                                         "properties": {
-                                            "date": {"type": "string"},
+                                            "date": {"type": "string", "format": "date"},
                                             "fvmTransactions": {"type": "integer"},
                                             "gateTaps": {"type": "integer"},
                                             "busTaps": {"type": "integer"},
@@ -1125,7 +1667,7 @@ def create_swagger_spec():
                                     "requirementId": {"type": "string"},
                                     "defectId": {"type": "string"},
                                     "testType": {"type": "string"},
-                                    "date": {"type": "string"},
+                                    "date": {"type": "string", "format": "date"},
                                     "error": {"type": "string"}
                                 }
                             }
@@ -1155,7 +1697,7 @@ def create_swagger_spec():
                 },
                 "TestRunEvent": {
                     "type": "object",
-                    "required": ["kind", "testCase", "result"],
+                    "required": ["kind", "testCase", "result", "executionDate"],
                     "properties": {
                         "kind": {"type": "string", "enum": ["TEST_RUN"]},
                         "testCase": {
@@ -1261,7 +1803,7 @@ def create_swagger_spec():
                                 "expected": {"type": "string"},
                                 "actual": {"type": "string"},
                                 "status": {"type": "string"},
-                                "testDate": {"type": "string"}
+                                "testDate": {"type": "string", "format": "date"}
                             }
                         }
                     }
@@ -1275,7 +1817,7 @@ def create_swagger_spec():
                             "type": "object",
                             "required": ["date"],
                             "properties": {
-                                "date": {"type": "string"},
+                                "date": {"type": "string", "format": "date"},
                                 "fvmTransactions": {"type": "integer"},
                                 "gateTaps": {"type": "integer"},
                                 "busTaps": {"type": "integer"},
@@ -1291,20 +1833,83 @@ def create_swagger_spec():
             }
         }
     }
-    return jsonify(swagger_spec)
+    return swagger_spec
+
+# Serialized spec, built on first request: body, gzip body and their ETags
+swagger_payload = {}
+
+def get_swagger_payload():
+    """Serialize and compress the Swagger spec once per process"""
+    if not swagger_payload:
+        body = json.dumps(build_swagger_spec(), separators=(',', ':')).encode()
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        swagger_payload.update({
+            'body': body,
+            'gzip': gzip.compress(body, compresslevel=9),
+            'etag': etag,
+            'gzip_etag': f"{etag}-gzip"
+        })
+    return swagger_payload
+
+# Swagger JSON endpoint
+@app.route('/static/swagger.json')
+def create_swagger_spec():
+    """Serve the precomputed Swagger specification with ETag revalidation"""
+    payload = get_swagger_payload()
+    use_gzip = 'gzip' in request.accept_encodings
+    etag = payload['gzip_etag'] if use_gzip else payload['etag']
+    
+    if request.if_none_match.contains(payload['etag']) or request.if_none_match.contains(payload['gzip_etag']):
+        response = Response(status=304)
+    else:
+        response = Response(payload['gzip'] if use_gzip else payload['body'], mimetype='application/json')
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=300, must-revalidate'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
 
 def init_database():
     """Initialize the database with all required tables"""
     # Database initialization is now handled by SQLAlchemy in database_postgresql.py
+    # Keep test_runs partitions a few months ahead so inserts don't land in the default partition
+    db.ensure_test_run_partitions()
     print("✅ Database initialized via SQLAlchemy")
 
 # Initialize database on startup
 init_database()
 
-# Database helper functions - now using PostgreSQL
-def create_user(user_data):
-    """Create a new user"""
-    return db.create_user(user_data)
+# One database session and transaction per request, shared by all db calls in the handler
+@app.before_request
+def begin_request_unit_of_work():
+    db.begin_unit_of_work()
+
+@app.after_request
+def commit_request_unit_of_work(response):
+    # Commit before the response is sent so a failed commit is reported, not hidden behind a 2xx
+    if response.status_code >= 500:
+        return response
+    try:
+        db.commit_unit_of_work()
+    except Exception as e:
+        print(f"Error committing request transaction: {e}")
+        traceback.print_exc()
+        # after_request hooks must return a Response object; a (body, status) tuple isn't converted
+        error_response = jsonify({"error": "Internal server error"})
+        error_response.status_code = 500
+        return error_response
+    return response
+
+@app.teardown_request
+def end_request_unit_of_work(exc):
+    db.end_unit_of_work()
+
+# Database helper functions - now using PostgreSQL
+def create_user(user_data):
+    """Create a new user"""
+    return db.create_user(user_data)
 
 def get_user_by_username(username):
     """Get user by username"""
@@ -1415,6 +2020,127 @@ def decode_jwt_token(token):
     except jwt.InvalidTokenError:
         return None
 
+# Response cache for polled GET endpoints: seconds an entry is served, and total body bytes kept
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 30))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+class ResponseCache:
+    """In-process LRU cache of GET response bodies with a TTL, invalidated by table writes.
+    
+    Entries are keyed by path and query string plus the table_versions counters
+    of the tables the endpoint reads, so a write committed by any worker
+    process changes the key; a write committed by this process also evicts
+    the entries built from the table right away, freeing their memory.
+    """
+    
+    def __init__(self, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (expires_at, tables, body, status, mimetype)
+        self.size = 0
+        self.lock = threading.Lock()
+    
+    def key(self, versions):
+        return (request.path, tuple(sorted(request.args.items(multi=True))), versions)
+    
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self.evict(key)
+                return None
+            self.entries.move_to_end(key)
+            return entry
+    
+    def put(self, key, tables, body: bytes, status: int, mimetype: str):
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.evict(key)
+            self.entries[key] = (time.monotonic() + self.ttl, set(tables), body, status, mimetype)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                self.evict(next(iter(self.entries)))
+    
+    def evict(self, key):
+        # Callers hold the lock
+        entry = self.entries.pop(key)
+        self.size -= len(entry[2])
+    
+    def invalidate(self, tables):
+        """Drop every entry built from any of the tables; registered as a table change listener"""
+        with self.lock:
+            for key in [key for key, entry in self.entries.items() if entry[1] & tables]:
+                self.evict(key)
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+response_cache = ResponseCache(RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_BYTES)
+table_change_listeners.append(response_cache.invalidate)
+
+def cached_response(*tables):
+    """Conditional GET and response caching for an endpoint that reads the given tables.
+    
+    The ETag and Last-Modified come from the tables' table_versions counters,
+    so If-None-Match / If-Modified-Since are answered with 304 Not Modified
+    without reading or serializing any rows. Otherwise successful responses
+    are served from response_cache (X-Cache: HIT or MISS) until one of the
+    tables is written; a RESPONSE_CACHE_TTL_SECONDS of 0 disables the cache.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method != 'GET':
+                return f(*args, **kwargs)
+            marker = db.get_table_versions(list(tables))
+            if marker is None:
+                return f(*args, **kwargs)
+            
+            key = response_cache.key(marker['versions'])
+            etag = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+            last_modified = marker['updated_at'].replace(tzinfo=datetime.timezone.utc) if marker['updated_at'] else None
+            
+            def add_validators(response):
+                response.set_etag(etag)
+                if last_modified:
+                    response.last_modified = last_modified
+                # Clients may keep the body but must revalidate before reusing it
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+            
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains(etag)
+            else:
+                # HTTP dates have whole seconds, so compare against the truncated change time
+                not_modified = bool(last_modified and request.if_modified_since
+                                    and last_modified.replace(microsecond=0) <= request.if_modified_since)
+            if not_modified:
+                return add_validators(Response(status=304))
+            
+            if response_cache.ttl > 0:
+                cached = response_cache.get(key)
+                if cached is not None:
+                    _, _, body, status, mimetype = cached
+                    response = Response(body, status=status, mimetype=mimetype)
+                    response.headers['X-Cache'] = 'HIT'
+                    return add_validators(response)
+            
+            response = app.make_response(f(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            if response_cache.ttl > 0:
+                response_cache.put(key, tables, response.get_data(), response.status_code, response.mimetype)
+                response.headers['X-Cache'] = 'MISS'
+            return add_validators(response)
+        return decorated_function
+    return decorator
+
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -1429,8 +2155,47 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def idempotent(f):
+    """Replay the stored response when a request repeats an Idempotency-Key header.
+    
+    The first request with a key runs normally and its response is stored in
+    the same transaction as its writes. Retries get that response back with
+    Idempotent-Replayed: true; reusing a key with a different body is a 422.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        idempotency_key = request.headers.get('Idempotency-Key')
+        if not idempotency_key:
+            return f(*args, **kwargs)
+        if len(idempotency_key) > 255:
+            return jsonify({'error': 'Idempotency-Key must be at most 255 characters'}), 400
+        
+        endpoint = request.path
+        request_hash = hashlib.sha256(request.get_data()).hexdigest()
+        
+        claimed = db.claim_idempotency_key(idempotency_key, endpoint, request_hash)
+        if claimed is None:
+            return jsonify({"error": "Internal server error"}), 500
+        if not claimed:
+            stored = db.get_idempotent_response(idempotency_key, endpoint)
+            if stored is None or stored['response'] is None:
+                return jsonify({'error': 'A request with this Idempotency-Key is still being processed'}), 409
+            if stored['request_hash'] != request_hash:
+                return jsonify({'error': 'Idempotency-Key was already used with a different request body'}), 422
+            response = Response(stored['response'], status=stored['status_code'], mimetype='application/json')
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+        
+        response = app.make_response(f(*args, **kwargs))
+        # 5xx responses roll back the request transaction, releasing the key for a retry
+        if response.status_code < 500:
+            db.store_idempotent_response(idempotency_key, endpoint, response.status_code, response.get_data(as_text=True))
+        return response
+    return decorated_function
+
 # --- Test Cases API Endpoints ---
 @app.route('/api/testcases', methods=['GET', 'POST'])
+@cached_response(TestCase.__tablename__)
 def handle_structured_test_cases():
     if request.method == 'GET':
         try:
@@ -1515,6 +2280,7 @@ def create_requirement():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/requirements', methods=['GET'])
+@cached_response(Requirement.__tablename__)
 def get_requirements():
     try:
         requirements = get_all_requirements()
@@ -1561,6 +2327,7 @@ def receive_test_run_data():
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/api/testruns', methods=['GET'])
+@cached_response(TestRun.__tablename__)
 def get_test_runs():
     try:
         test_runs = get_all_test_runs()
@@ -1594,6 +2361,7 @@ def receive_defect_data():
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/api/defects', methods=['GET'])
+@cached_response(Defect.__tablename__)
 def get_defects():
     try:
         defects = get_all_defects()
@@ -1629,6 +2397,7 @@ def receive_test_type_summary_data():
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/api/testtypesummary', methods=['GET'])
+@cached_response(TestTypeSummary.__tablename__)
 def get_test_type_summary_data():
     try:
         summary_data = get_all_test_type_summary()
@@ -1664,6 +2433,7 @@ def receive_transit_metrics_data():
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/api/transitmetricsdaily', methods=['GET'])
+@cached_response(TransitMetric.__tablename__)
 def get_transit_metrics_data():
     try:
         metrics_data = get_all_transit_metrics()
@@ -1689,6 +2459,7 @@ def get_test_cases_by_requirement_route():
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/api/testcases/with_description', methods=['GET'])
+@cached_response(TestCase.__tablename__, Requirement.__tablename__)
 def get_structured_test_cases_with_description():
     try:
         test_cases = get_test_cases_with_description()
@@ -2162,13 +2933,41 @@ def reset_password():
 # REST API v1 ENDPOINTS - Comprehensive API for all entities
 # ============================================================================
 
+# Page size bounds for the keyset-paginated v1 list endpoints
+DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', 100))
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 1000))
+
+def get_pagination_args():
+    """Read the limit/cursor query parameters of a v1 list request.
+    
+    Returns None when neither is given, so the endpoint keeps returning the
+    full list for existing clients. Raises ValueError for an invalid limit.
+    """
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    if limit is None and cursor is None:
+        return None
+    try:
+        limit = int(limit) if limit is not None else DEFAULT_PAGE_SIZE
+    except ValueError:
+        raise ValueError(f"Invalid limit: {limit}")
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit, cursor
+
 # --- Requirements v1 API ---
 @app.route('/api/v1/requirements', methods=['GET'])
+@cached_response(Requirement.__tablename__)
 def get_requirements_v1():
     """Get all requirements - REST API v1"""
     try:
+        pagination = get_pagination_args()
+        if pagination:
+            return jsonify(db.get_requirements_page(*pagination)), 200
         requirements = get_all_requirements()
         return jsonify(requirements), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error getting requirements: {e}")
         traceback.print_exc()
@@ -2211,11 +3010,17 @@ def get_requirement_by_id_v1(requirement_id):
 
 # --- Test Cases v1 API ---
 @app.route('/api/v1/test-cases', methods=['GET'])
+@cached_response(TestCase.__tablename__)
 def get_test_cases_v1():
     """Get all test cases - REST API v1"""
     try:
+        pagination = get_pagination_args()
+        if pagination:
+            return jsonify(db.get_test_cases_page(*pagination)), 200
         test_cases = get_all_test_cases()
         return jsonify(test_cases), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error getting test cases: {e}")
         traceback.print_exc()
@@ -2257,12 +3062,46 @@ def get_test_case_by_id_v1(test_case_id):
         return jsonify({"error": "Internal server error"}), 500
 
 # --- Test Runs v1 API ---
+def get_test_run_criteria():
+    """Read the test run filter query parameters into find_test_runs criteria.
+    
+    'to' is inclusive; a date without a time covers that whole day.
+    Raises ValueError for a malformed customerId or date.
+    """
+    criteria = {}
+    customer_id = request.args.get('customerId')
+    if customer_id is not None:
+        try:
+            criteria['customer_id'] = int(customer_id)
+        except ValueError:
+            raise ValueError(f"Invalid customerId: {customer_id}")
+    for param, key in [('sourceSystem', 'source_system'), ('result', 'result'), ('testCaseId', 'test_case_id')]:
+        if request.args.get(param) is not None:
+            criteria[key] = request.args.get(param)
+    if request.args.get('from'):
+        criteria['executed_from'] = parse_datetime(request.args['from'])
+    if request.args.get('to'):
+        executed_to = request.args['to']
+        criteria['executed_before'] = parse_datetime(executed_to)
+        if len(executed_to) == 10:
+            criteria['executed_before'] += datetime.timedelta(days=1)
+        else:
+            criteria['executed_before'] += datetime.timedelta(microseconds=1)
+    return criteria
+
 @app.route('/api/v1/test-runs', methods=['GET'])
+@cached_response(TestRun.__tablename__)
 def get_test_runs_v1():
-    """Get all test runs - REST API v1"""
+    """Get all test runs, optionally filtered - REST API v1"""
     try:
-        test_runs = get_all_test_runs()
+        criteria = get_test_run_criteria()
+        pagination = get_pagination_args()
+        if pagination:
+            return jsonify(db.get_test_runs_page(*pagination, **criteria)), 200
+        test_runs = db.find_test_runs(**criteria) if criteria else get_all_test_runs()
         return jsonify(test_runs), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error getting test runs: {e}")
         traceback.print_exc()
@@ -2279,6 +3118,12 @@ def create_test_run_v1():
         # Validate required fields
         if not data.get('run_id') or not data.get('test_case_id') or not data.get('result'):
             return jsonify({"error": "run_id, test_case_id, and result are required"}), 400
+        if not data.get('customer_id') or not data.get('source_system'):
+            return jsonify({"error": "customer_id and source_system are required"}), 400
+        # Part of the de-duplication key, so a retry must carry the same date rather than the time it arrived
+        if not data.get('execution_date'):
+            return jsonify({"error": "execution_date is required"}), 400
+        data.setdefault('test_run_id', new_test_run_id())
         
         if create_test_run(data):
             return jsonify(data), 201
@@ -2290,6 +3135,7 @@ def create_test_run_v1():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/v1/test-runs/bulk', methods=['POST'])
+@idempotent
 def create_bulk_test_runs_v1():
     """Create multiple test runs - REST API v1 (similar to your sample)"""
     try:
@@ -2301,58 +3147,15 @@ def create_bulk_test_runs_v1():
         if not events:
             return jsonify({"error": "No events provided"}), 400
         
-        accepted = 0
-        duplicates = 0
-        failed = 0
-        items = []
-        
-        for event in events:
-            try:
-                # Extract test case info
-                test_case = event.get('testCase', {})
-                test_case_id = str(test_case.get('id', ''))
-                
-                # Create test run data
-                test_run_data = {
-                    'run_id': str(uuid.uuid4()),  # Generate unique run ID
-                    'test_case_id': test_case_id,
-                    'execution_date': event.get('executionDate', datetime.datetime.now().isoformat()),
-                    'result': event.get('result', 'Unknown'),
-                    'observed_time': event.get('observedTimeMs', 0),
-                    'executed_by': event.get('executedBy', 'Unknown'),
-                    'remarks': event.get('remarks', '')
-                }
-                
-                if create_test_run(test_run_data):
-                    accepted += 1
-                    items.append({
-                        'status': 'accepted',
-                        'runId': test_run_data['run_id'],
-                        'testCaseId': int(test_case_id) if test_case_id.isdigit() else 0
-                    })
-                else:
-                    failed += 1
-                    items.append({
-                        'status': 'failed',
-                        'runId': test_run_data['run_id'],
-                        'testCaseId': int(test_case_id) if test_case_id.isdigit() else 0
-                    })
-                    
-            except Exception as e:
-                failed += 1
-                print(f"Error processing event: {e}")
-                items.append({
-                    'status': 'failed',
-                    'runId': str(uuid.uuid4()),
-                    'testCaseId': 0
-                })
-        
-        response = {
-            'accepted': accepted,
-            'duplicates': duplicates,
-            'failed': failed,
-            'items': items
-        }
+        try:
+            customer_id, source_system = get_ingest_source(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        # Events on this route don't need a kind; they are all test runs, with this route's defaults
+        defaults = {'result': 'Unknown', 'observedTimeMs': 0, 'executedBy': 'Unknown', 'remarks': ''}
+        test_run_events = [{**defaults, **event, 'kind': 'TEST_RUN'} if isinstance(event, dict) else event
+                           for event in events]
+        response = process_events(test_run_events, customer_id, source_system)
         
         return jsonify(response), 201
         
@@ -2363,11 +3166,17 @@ def create_bulk_test_runs_v1():
 
 # --- Defects v1 API ---
 @app.route('/api/v1/defects', methods=['GET'])
+@cached_response(Defect.__tablename__)
 def get_defects_v1():
     """Get all defects - REST API v1"""
     try:
+        pagination = get_pagination_args()
+        if pagination:
+            return jsonify(db.get_defects_page(*pagination)), 200
         defects = get_all_defects()
         return jsonify(defects), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error getting defects: {e}")
         traceback.print_exc()
@@ -2396,11 +3205,17 @@ def create_defect_v1():
 
 # --- Test Type Summary v1 API ---
 @app.route('/api/v1/test-type-summary', methods=['GET'])
+@cached_response(TestTypeSummary.__tablename__)
 def get_test_type_summary_v1():
     """Get all test type summaries - REST API v1"""
     try:
+        pagination = get_pagination_args()
+        if pagination:
+            return jsonify(db.get_test_type_summary_page(*pagination)), 200
         summaries = get_all_test_type_summary()
         return jsonify(summaries), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error getting test type summaries: {e}")
         traceback.print_exc()
@@ -2429,11 +3244,17 @@ def create_test_type_summary_v1():
 
 # --- Transit Metrics v1 API ---
 @app.route('/api/v1/transit-metrics', methods=['GET'])
+@cached_response(TransitMetric.__tablename__)
 def get_transit_metrics_v1():
     """Get all transit metrics - REST API v1"""
     try:
+        pagination = get_pagination_args()
+        if pagination:
+            return jsonify(db.get_transit_metrics_page(*pagination)), 200
         metrics = get_all_transit_metrics()
         return jsonify(metrics), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error getting transit metrics: {e}")
         traceback.print_exc()
@@ -2460,11 +3281,256 @@ def create_transit_metric_v1():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+# Days covered by the transit series when no 'from' is given
+TRANSIT_SERIES_DEFAULT_DAYS = 90
+
+@app.route('/api/v1/transit-metrics/series', methods=['GET'])
+def get_transit_series_v1():
+    """Transit metrics aggregated per day, week or month - REST API v1"""
+    try:
+        try:
+            day_from, day_to = get_day_range(TRANSIT_SERIES_DEFAULT_DAYS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        bucket = request.args.get('bucket', 'day')
+        if bucket not in ('day', 'week', 'month'):
+            return jsonify({"error": "bucket must be 'day', 'week' or 'month'"}), 400
+        
+        items = db.get_transit_series(day_from, day_to, bucket)
+        if items is None:
+            return jsonify({"error": "Failed to aggregate transit metrics"}), 500
+        return jsonify({
+            'from': day_from.isoformat(),
+            'to': day_to.isoformat(),
+            'bucket': bucket,
+            'items': items
+        }), 200
+    except Exception as e:
+        print(f"Error getting transit series: {e}")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+# --- Export v1 API ---
+@app.route('/api/v1/export/<entity>', methods=['GET'])
+def export_entity_v1(entity):
+    """Stream every row of an entity as NDJSON or a JSON array - REST API v1"""
+    if entity not in EXPORT_ENTITIES:
+        return jsonify({"error": f"Unknown entity: {entity}. Expected one of {sorted(EXPORT_ENTITIES)}"}), 404
+    
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'json'):
+        return jsonify({"error": "format must be 'ndjson' or 'json'"}), 400
+    
+    def generate():
+        try:
+            rows = db.iter_entity(entity)
+            if export_format == 'ndjson':
+                for row in rows:
+                    yield json.dumps(row, default=str) + '\n'
+            else:
+                yield '['
+                for index, row in enumerate(rows):
+                    yield (',' if index else '') + json.dumps(row, default=str)
+                yield ']'
+        except Exception as e:
+            # Headers are already sent, so the truncated body is the only signal left
+            print(f"Error exporting {entity}: {e}")
+            traceback.print_exc()
+    
+    mimetype = 'application/x-ndjson' if export_format == 'ndjson' else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+# --- Traceability v1 API ---
+@app.route('/api/v1/traceability', methods=['GET'])
+@cached_response(Requirement.__tablename__, TestCase.__tablename__, TestRun.__tablename__, Defect.__tablename__)
+def get_traceability_v1():
+    """Per-requirement coverage, one page at a time - REST API v1"""
+    try:
+        gap = request.args.get('gap')
+        if gap is not None and gap not in TRACEABILITY_GAPS:
+            return jsonify({"error": f"gap must be one of: {', '.join(TRACEABILITY_GAPS)}"}), 400
+        try:
+            limit, cursor = get_pagination_args() or (DEFAULT_PAGE_SIZE, None)
+            page = db.get_traceability_page(limit, cursor, component=request.args.get('component'), gap=gap)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(page), 200
+    except Exception as e:
+        print(f"Error getting traceability: {e}")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+# --- Analytics v1 API ---
+# Days covered by analytics endpoints when no 'from' is given
+ANALYTICS_DEFAULT_DAYS = 30
+
+def get_day_range(default_days=ANALYTICS_DEFAULT_DAYS):
+    """Read the inclusive from/to day range, defaulting to the last default_days days.
+    
+    Raises ValueError for a malformed date or a range that ends before it starts.
+    """
+    day_to = parse_date(request.args['to']) if request.args.get('to') else datetime.date.today()
+    if request.args.get('from'):
+        day_from = parse_date(request.args['from'])
+    else:
+        day_from = day_to - datetime.timedelta(days=default_days - 1)
+    if day_from > day_to:
+        raise ValueError("'from' must not be after 'to'")
+    return day_from, day_to
+
+@app.route('/api/v1/analytics/pass-rate', methods=['GET'])
+def get_pass_rate_v1():
+    """Daily pass-rate trends from the rollup table - REST API v1"""
+    try:
+        try:
+            day_from, day_to = get_day_range()
+            customer_id = request.args.get('customerId')
+            customer_id = int(customer_id) if customer_id is not None else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        group_by = request.args.get('groupBy')
+        if group_by not in (None, 'day', 'component'):
+            return jsonify({"error": "groupBy must be 'day' or 'component'"}), 400
+        
+        items = db.get_pass_rate(day_from, day_to, customer_id=customer_id,
+                                 test_case_id=request.args.get('testCaseId'),
+                                 component=request.args.get('component'), group_by=group_by)
+        return jsonify({
+            'from': day_from.isoformat(),
+            'to': day_to.isoformat(),
+            'groupBy': group_by,
+            'items': items
+        }), 200
+    except Exception as e:
+        print(f"Error getting pass rate: {e}")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+# Twelve weeks by default, so the weekly series is long enough to show a trend
+DEFECT_REPORT_DEFAULT_DAYS = 84
+
+@app.route('/api/v1/analytics/defects', methods=['GET'])
+def get_defect_lifecycle_v1():
+    """Defect lifecycle metrics - REST API v1"""
+    try:
+        try:
+            day_from, day_to = get_day_range(DEFECT_REPORT_DEFAULT_DAYS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        report = db.get_defect_lifecycle(day_from, day_to)
+        if report is None:
+            return jsonify({"error": "Failed to compute defect metrics"}), 500
+        return jsonify(report), 200
+    except Exception as e:
+        print(f"Error getting defect lifecycle: {e}")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/v1/analytics/transit-anomalies', methods=['GET'])
+def get_transit_anomalies_v1():
+    """Transit metric days that deviated from their EWMA baseline - REST API v1"""
+    try:
+        try:
+            day_from, day_to = get_day_range(TRANSIT_SERIES_DEFAULT_DAYS)
+            min_z = float(request.args['minZ']) if request.args.get('minZ') else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        metric = request.args.get('metric')
+        if metric is not None and metric not in TRANSIT_ANOMALY_METRICS:
+            return jsonify({"error": f"metric must be one of: {', '.join(TRANSIT_ANOMALY_METRICS)}"}), 400
+        
+        items = db.get_transit_anomalies(day_from, day_to, metric=metric, min_z=min_z)
+        return jsonify({
+            'from': day_from.isoformat(),
+            'to': day_to.isoformat(),
+            'alpha': TRANSIT_ANOMALY_ALPHA,
+            'threshold': TRANSIT_ANOMALY_Z,
+            'items': items
+        }), 200
+    except Exception as e:
+        print(f"Error getting transit anomalies: {e}")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+# Days covered by the test type trends when no 'from' is given
+TEST_TYPE_TRENDS_DEFAULT_DAYS = 90
+
+@app.route('/api/v1/analytics/test-type-trends', methods=['GET'])
+def get_test_type_trends_v1():
+    """Parsed test type summary values aggregated per day, week or month - REST API v1"""
+    try:
+        try:
+            day_from, day_to = get_day_range(TEST_TYPE_TRENDS_DEFAULT_DAYS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        bucket = request.args.get('bucket', 'week')
+        if bucket not in ('day', 'week', 'month'):
+            return jsonify({"error": "bucket must be 'day', 'week' or 'month'"}), 400
+        
+        items = db.get_test_type_trends(day_from, day_to, bucket, test_type=request.args.get('testType'))
+        if items is None:
+            return jsonify({"error": "Failed to aggregate test type summaries"}), 500
+        return jsonify({
+            'from': day_from.isoformat(),
+            'to': day_to.isoformat(),
+            'bucket': bucket,
+            'items': items
+        }), 200
+    except Exception as e:
+        print(f"Error getting test type trends: {e}")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/v1/analytics/flaky', methods=['GET'])
+def get_flaky_v1():
+    """Flaky test cases from the cached flakiness stats - REST API v1"""
+    try:
+        try:
+            min_flip_rate = float(request.args.get('minFlipRate', 0))
+            min_runs = int(request.args.get('minRuns', 5))
+            limit = int(request.args.get('limit', 50))
+        except ValueError:
+            return jsonify({"error": "minFlipRate must be a number, minRuns and limit integers"}), 400
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+        
+        # Read-only: stale rows are recomputed by the ingest worker or refresh_rollups.py flaky
+        result = db.get_flaky_test_cases(min_flip_rate=min_flip_rate, min_runs=min_runs, limit=limit)
+        return jsonify({
+            'lookbackDays': FLAKY_LOOKBACK_DAYS,
+            'lastN': FLAKY_LAST_N,
+            'stale': result['stale'],
+            'items': result['items']
+        }), 200
+    except Exception as e:
+        print(f"Error getting flaky test cases: {e}")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
 # ============================================================================
 # UNIFIED BULK UPLOAD API - SINGLE ENDPOINT FOR ALL DATA TYPES
 # ============================================================================
 
+def get_ingest_source(data):
+    """Read the customerId and sourceSystem that uploaded test runs are stamped with.
+    
+    Raises ValueError when either is missing or customerId is not an integer.
+    """
+    if not data.get('customerId') or not data.get('sourceSystem'):
+        raise ValueError("customerId and sourceSystem are required")
+    try:
+        customer_id = int(data['customerId'])
+    except (TypeError, ValueError):
+        raise ValueError("customerId must be an integer")
+    return customer_id, str(data['sourceSystem'])
+
+def new_test_run_id():
+    """Generate the test_run_id shared by the runs of one upload"""
+    return f"TR-{datetime.datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8]}"
+
 @app.route('/api/v1/results', methods=['POST'])
+@idempotent
 def unified_bulk_upload():
     """Unified bulk upload endpoint - accepts all data types and routes to appropriate tables"""
     try:
@@ -2476,401 +3542,417 @@ def unified_bulk_upload():
         if not data.get('customerId') or not data.get('sourceSystem') or not data.get('events'):
             return jsonify({"error": "customerId, sourceSystem, and events are required"}), 400
         
-        customer_id = data['customerId']
-        source_system = data['sourceSystem']
+        try:
+            customer_id, source_system = get_ingest_source(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         events = data['events']
         
-        accepted = 0
-        duplicates = 0
-        failed = 0
-        items = []
-        
-        for event in events:
-            try:
-                event_kind = event.get('kind')
-                
-                # Route based on event kind
-                if event_kind == 'TEST_RUN':
-                    result = process_test_run_event(event, items)
-                    if result['success']:
-                        accepted += 1
-                    else:
-                        failed += 1
-                        
-                elif event_kind == 'REQUIREMENT':
-                    result = process_requirement_event(event, items)
-                    if result['success']:
-                        accepted += 1
-                    elif result['duplicate']:
-                        duplicates += 1
-                    else:
-                        failed += 1
-                        
-                elif event_kind == 'TEST_CASE':
-                    result = process_test_case_event(event, items)
-                    if result['success']:
-                        accepted += 1
-                    elif result['duplicate']:
-                        duplicates += 1
-                    else:
-                        failed += 1
-                        
-                elif event_kind == 'DEFECT':
-                    result = process_defect_event(event, items)
-                    if result['success']:
-                        accepted += 1
-                    elif result['duplicate']:
-                        duplicates += 1
-                    else:
-                        failed += 1
-                        
-                elif event_kind == 'TEST_TYPE_SUMMARY':
-                    result = process_test_type_summary_event(event, items)
-                    if result['success']:
-                        accepted += 1
-                    else:
-                        failed += 1
-                        
-                elif event_kind == 'TRANSIT_METRIC':
-                    result = process_transit_metric_event(event, items)
-                    if result['success']:
-                        accepted += 1
-                    elif result['duplicate']:
-                        duplicates += 1
-                    else:
-                        failed += 1
-                        
-                else:
-                    failed += 1
-                    items.append({
-                        'status': 'failed',
-                        'error': f'Unknown event kind: {event_kind}'
-                    })
-                    
-            except Exception as e:
-                failed += 1
-                items.append({
-                    'status': 'failed',
-                    'error': str(e)
-                })
+        if request.args.get('async', '').lower() in ('1', 'true', 'yes'):
+            if not isinstance(events, list):
+                return jsonify({"error": "events must be a list"}), 400
+            invalid = validate_events(events)
+            if invalid:
+                return jsonify({
+                    "error": "Some events are invalid; nothing was queued",
+                    "failed": len(invalid),
+                    "items": invalid
+                }), 400
+            
+            # Committed with the request (and its Idempotency-Key response); the commit wakes the worker
+            batch_id = db.enqueue_ingest_batch(customer_id, source_system, events)
+            if not batch_id:
+                return jsonify({"error": "Failed to queue upload"}), 500
+            return jsonify({
+                'batchId': batch_id,
+                'status': 'queued',
+                'statusUrl': f"/api/v1/results/{batch_id}"
+            }), 202
         
-        return jsonify({
-            'accepted': accepted,
-            'duplicates': duplicates,
-            'failed': failed,
-            'items': items
-        }), 200
+        return jsonify(process_events(events, customer_id, source_system)), 200
         
     except Exception as e:
         print(f"Error in unified bulk upload: {e}")
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
-def process_test_run_event(event, items):
-    """Process test run event"""
+@app.route('/api/v1/results/<batch_id>', methods=['GET'])
+def get_ingest_batch_status(batch_id):
+    """Status of an asynchronous results upload, with the usual results once processed"""
     try:
-        test_case = event.get('testCase', {})
-        test_case_id = test_case.get('id')
-        title = test_case.get('title')
-        component = test_case.get('component')
-        
-        # Generate unique run ID
-        run_id = str(uuid.uuid4())
-        
-        # Create test run data
-        test_run_data = {
-            'run_id': run_id,
-            'test_case_id': str(test_case_id),
-            'execution_date': event.get('executionDate'),
-            'result': event.get('result'),
-            'observed_time': event.get('observedTimeMs'),
-            'executed_by': event.get('executedBy'),
-            'remarks': event.get('remarks')
-        }
+        batch = db.get_ingest_batch(batch_id)
+        if not batch:
+            return jsonify({"error": f"Batch with ID {batch_id} not found"}), 404
         
-        # Check if test case exists
-        existing_test_case = db.get_test_case_by_id(str(test_case_id))
-        if not existing_test_case:
-            # Create test case if it doesn't exist
-            test_case_data = {
-                'test_case_id': str(test_case_id),
-                'title': title,
-                'component': component,
-                'type': 'Automated',
-                'status': 'Active',
-                'created_by': event.get('executedBy', 'system'),
-                'created_at': datetime.datetime.now()
-            }
-            db.create_test_case(test_case_data)
-        
-        # Create test run
-        if db.create_test_run(test_run_data):
-            items.append({
-                'status': 'accepted',
-                'runId': run_id,
-                'testCaseId': test_case_id
-            })
-            return {'success': True}
-        else:
-            items.append({
-                'status': 'failed',
-                'runId': None,
-                'testCaseId': test_case_id,
-                'error': 'Failed to create test run'
-            })
-            return {'success': False}
-            
+        response = {
+            'batchId': batch['batch_id'],
+            'status': batch['status'],
+            'createdAt': batch['created_at'],
+            'completedAt': batch['completed_at']
+        }
+        if batch['result']:
+            response.update(batch['result'])
+        if batch['error']:
+            response['error'] = batch['error']
+        return jsonify(response), 200
     except Exception as e:
-        items.append({
-            'status': 'failed',
-            'runId': None,
-            'testCaseId': event.get('testCase', {}).get('id'),
-            'error': str(e)
-        })
-        return {'success': False}
+        print(f"Error getting ingest batch status: {e}")
+        traceback.print_exc()
+        return jsonify({"error": "Internal server error"}), 500
 
-def process_requirement_event(event, items):
-    """Process requirement event"""
-    try:
-        requirement_data = event.get('requirement', {})
-        requirement_id = requirement_data.get('id')
-        
-        # Check if requirement already exists
-        existing_requirement = db.get_requirement_by_id(requirement_id)
-        if existing_requirement:
-            items.append({
-                'status': 'duplicate',
-                'requirementId': requirement_id,
-                'error': 'Requirement already exists'
-            })
-            return {'success': False, 'duplicate': True}
-        
-        # Create requirement data
-        req_data = {
-            'requirement_id': requirement_id,
-            'title': requirement_data.get('title'),
-            'description': requirement_data.get('description'),
-            'component': requirement_data.get('component'),
-            'priority': requirement_data.get('priority'),
-            'status': requirement_data.get('status', 'Active'),
-            'jira_id': requirement_data.get('jiraId'),
-            'created_at': datetime.datetime.now()
-        }
+# --- Background ingest worker ---
+# Started by ingest_worker.py, or in-process by the development server below
+INGEST_WORKER_ENABLED = os.getenv('INGEST_WORKER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+INGEST_POLL_SECONDS = float(os.getenv('INGEST_POLL_SECONDS', 2))
+# Stale flakiness rows recomputed per poll, keeping each pass short
+FLAKY_REFRESH_LIMIT = int(os.getenv('FLAKY_REFRESH_LIMIT', 2000))
+
+# Set when this process commits a queued batch, so the worker doesn't wait out its poll interval
+ingest_worker_wakeup = threading.Event()
+ingest_worker_thread = None
+
+def wake_ingest_worker(tables):
+    if IngestBatch.__tablename__ in tables:
+        ingest_worker_wakeup.set()
+
+table_change_listeners.append(wake_ingest_worker)
+
+def drain_ingest_spool():
+    """Process queued ingest batches until none are left; returns how many were processed"""
+    processed = 0
+    while True:
+        batch = db.claim_ingest_batch()
+        if not batch:
+            return processed
         
-        if db.create_requirement(req_data):
-            items.append({
-                'status': 'accepted',
-                'requirementId': requirement_id
-            })
-            return {'success': True}
+        # Rows and the batch result are committed together, in one transaction per batch
+        db.begin_unit_of_work()
+        try:
+            # The batch id doubles as the test_run_id of the upload
+            result = process_events(batch['events'], batch['customer_id'], batch['source_system'], batch['batch_id'])
+            if not db.finish_ingest_batch(batch['batch_id'], batch['attempt'], result=result):
+                # Another worker reclaimed the batch; its attempt owns the result, so discard ours
+                raise RuntimeError(f"claim on attempt {batch['attempt']} was lost")
+            db.commit_unit_of_work()
+        except Exception as e:
+            print(f"Error processing ingest batch {batch['batch_id']}: {e}")
+            traceback.print_exc()
+            db.end_unit_of_work()
+            db.finish_ingest_batch(batch['batch_id'], batch['attempt'], error=str(e))
         else:
-            items.append({
-                'status': 'failed',
-                'requirementId': requirement_id,
-                'error': 'Failed to create requirement'
-            })
-            return {'success': False}
-            
-    except Exception as e:
-        items.append({
-            'status': 'failed',
-            'requirementId': event.get('requirement', {}).get('id'),
-            'error': str(e)
-        })
-        return {'success': False}
+            db.end_unit_of_work()
+        processed += 1
 
-def process_test_case_event(event, items):
-    """Process test case event"""
-    try:
-        test_case_data = event.get('testCase', {})
-        test_case_id = test_case_data.get('id')
-        
-        # Check if test case already exists
-        existing_test_case = db.get_test_case_by_id(test_case_id)
-        if existing_test_case:
-            items.append({
-                'status': 'duplicate',
-                'testCaseId': test_case_id,
-                'error': 'Test case already exists'
-            })
-            return {'success': False, 'duplicate': True}
-        
-        # Create test case data
-        tc_data = {
-            'test_case_id': test_case_id,
-            'title': test_case_data.get('title'),
-            'type': test_case_data.get('type'),
-            'component': test_case_data.get('component'),
-            'requirement_id': test_case_data.get('requirementId'),
-            'status': test_case_data.get('status', 'Active'),
-            'created_by': test_case_data.get('createdBy', 'system'),
-            'created_at': datetime.datetime.now(),
-            'pre_condition': test_case_data.get('preCondition'),
-            'test_steps': test_case_data.get('testSteps'),
-            'expected_result': test_case_data.get('expectedResult'),
-            'uploaded_at': datetime.datetime.now()
-        }
-        
-        if db.create_test_case(tc_data):
-            items.append({
+def run_ingest_worker():
+    """Drain the ingest spool forever, waking on new batches or every INGEST_POLL_SECONDS.
+    
+    Each pass also recomputes flakiness stats left stale by new test runs, so
+    /api/v1/analytics/flaky never has to.
+    """
+    while True:
+        try:
+            drain_ingest_spool()
+            db.refresh_flakiness(max_test_cases=FLAKY_REFRESH_LIMIT)
+        except Exception as e:
+            print(f"Error in ingest worker: {e}")
+        ingest_worker_wakeup.wait(INGEST_POLL_SECONDS)
+        ingest_worker_wakeup.clear()
+
+def start_ingest_worker():
+    """Start the background ingest worker thread once per process"""
+    global ingest_worker_thread
+    if ingest_worker_thread is None:
+        ingest_worker_thread = threading.Thread(target=run_ingest_worker, name='ingest-worker', daemon=True)
+        ingest_worker_thread.start()
+
+def build_test_run_row(event):
+    """Map a TEST_RUN event to a test run row and the test case row it implies"""
+    test_case = event.get('testCase', {})
+    test_case_id = test_case.get('id')
+    # Part of the de-duplication key: dating a run on receipt would give every retry a new key
+    if not event.get('executionDate'):
+        raise ValueError('executionDate is required')
+    
+    test_run_data = {
+        'run_id': str(uuid.uuid4()),
+        'test_case_id': str(test_case_id),
+        'execution_date': event.get('executionDate'),
+        'result': event.get('result'),
+        'observed_time': event.get('observedTimeMs'),
+        'executed_by': event.get('executedBy'),
+        'remarks': event.get('remarks')
+    }
+    test_run_data['content_hash'] = test_run_content_hash(test_run_data)
+    
+    # Created only if the test case doesn't exist yet
+    test_case_data = {
+        'test_case_id': str(test_case_id),
+        'title': test_case.get('title'),
+        'component': test_case.get('component'),
+        'type': 'Automated',
+        'status': 'Active',
+        'created_by': event.get('executedBy', 'system'),
+        'created_at': datetime.datetime.now()
+    }
+    return test_run_data, test_case_data
+
+def build_requirement_row(event):
+    """Map a REQUIREMENT event to a requirement row"""
+    requirement_data = event.get('requirement', {})
+    return {
+        'requirement_id': requirement_data.get('id'),
+        'title': requirement_data.get('title'),
+        'description': requirement_data.get('description'),
+        'component': requirement_data.get('component'),
+        'priority': requirement_data.get('priority'),
+        'status': requirement_data.get('status', 'Active'),
+        'jira_id': requirement_data.get('jiraId'),
+        'created_at': datetime.datetime.now()
+    }
+
+def build_test_case_row(event):
+    """Map a TEST_CASE event to a test case row"""
+    test_case_data = event.get('testCase', {})
+    return {
+        'test_case_id': test_case_data.get('id'),
+        'title': test_case_data.get('title'),
+        'type': test_case_data.get('type'),
+        'component': test_case_data.get('component'),
+        'requirement_id': test_case_data.get('requirementId'),
+        'status': test_case_data.get('status', 'Active'),
+        'created_by': test_case_data.get('createdBy', 'system'),
+        'created_at': datetime.datetime.now(),
+        'pre_condition': test_case_data.get('preCondition'),
+        'test_steps': test_case_data.get('testSteps'),
+        'expected_result': test_case_data.get('expectedResult'),
+        'uploaded_at': datetime.datetime.now()
+    }
+
+def build_defect_row(event):
+    """Map a DEFECT event to a defect row"""
+    defect_data = event.get('defect', {})
+    return {
+        'defect_id': defect_data.get('id'),
+        'title': defect_data.get('title'),
+        'severity': defect_data.get('severity'),
+        'status': defect_data.get('status', 'Open'),
+        'test_case_id': defect_data.get('testCaseId'),
+        'reported_by': defect_data.get('reportedBy'),
+        'created_at': datetime.datetime.now(),
+        'fixed_at': defect_data.get('fixedAt')
+    }
+
+def build_test_type_summary_row(event):
+    """Map a TEST_TYPE_SUMMARY event to a test type summary row"""
+    summary_data = event.get('summary', {})
+    return parse_summary_thresholds({
+        'test_type': summary_data.get('testType'),
+        'metrics': summary_data.get('metrics'),
+        'expected': summary_data.get('expected'),
+        'actual': summary_data.get('actual'),
+        'status': summary_data.get('status'),
+        'test_date': summary_data.get('testDate')
+    })
+
+def build_transit_metric_row(event):
+    """Map a TRANSIT_METRIC event to a transit metric row"""
+    metric_data = event.get('metric', {})
+    return {
+        'date': metric_data.get('date'),
+        'fvm_transactions': metric_data.get('fvmTransactions'),
+        'gate_taps': metric_data.get('gateTaps'),
+        'bus_taps': metric_data.get('busTaps'),
+        'success_rate_gate': metric_data.get('successRateGate'),
+        'success_rate_bus': metric_data.get('successRateBus'),
+        'avg_response_time': metric_data.get('avgResponseTime'),
+        'defect_count': metric_data.get('defectCount'),
+        'notes': metric_data.get('notes')
+    }
+
+# Event kind -> (row builder, model, natural key column, payload key, payload id field, item id key, label, duplicate error)
+RESULT_EVENT_KINDS = {
+    'REQUIREMENT': (build_requirement_row, Requirement, 'requirement_id', 'requirement', 'id', 'requirementId', 'requirement', 'Requirement already exists'),
+    'TEST_CASE': (build_test_case_row, TestCase, 'test_case_id', 'testCase', 'id', 'testCaseId', 'test case', 'Test case already exists'),
+    'DEFECT': (build_defect_row, Defect, 'defect_id', 'defect', 'id', 'defectId', 'defect', 'Defect already exists'),
+    'TEST_TYPE_SUMMARY': (build_test_type_summary_row, TestTypeSummary, None, 'summary', 'testType', 'testType', 'test type summary', None),
+    'TRANSIT_METRIC': (build_transit_metric_row, TransitMetric, 'date', 'metric', 'date', 'date', 'transit metric', 'Metric for this date already exists'),
+}
+
+def validate_events(events):
+    """Failed items, with their index, for the events process_events could not map to rows.
+    
+    Lets the asynchronous upload reject a malformed batch up front instead of
+    queueing it for the worker to fail.
+    """
+    invalid = []
+    for index, event in enumerate(events):
+        if not isinstance(event, dict):
+            invalid.append({'index': index, 'status': 'failed', 'error': 'Event must be an object'})
+            continue
+        event_kind = event.get('kind')
+        try:
+            if event_kind == 'TEST_RUN':
+                build_test_run_row(event)
+            elif event_kind in RESULT_EVENT_KINDS:
+                RESULT_EVENT_KINDS[event_kind][0](event)
+            else:
+                invalid.append({'index': index, 'status': 'failed', 'error': f'Unknown event kind: {event_kind}'})
+        except Exception as e:
+            invalid.append(dict(event_failed_item(event, str(e)), index=index))
+    return invalid
+
+def process_events(events, customer_id, source_system, test_run_id=None):
+    """Validate, de-duplicate and store a batch of result events.
+    
+    Test runs are stamped with the uploading customer_id and source_system
+    and share one test_run_id (generated unless given).
+    
+    Events are mapped to rows first, then existence is resolved with one
+    query per entity kind and the remaining rows are written with
+    db.bulk_insert, so a payload costs a handful of queries instead of one
+    lookup and one commit per event. Returns the accepted/duplicates/failed/items
+    response, with items in the same order as the events.
+    """
+    items = [None] * len(events)
+    pending = {kind: [] for kind in RESULT_EVENT_KINDS}
+    test_runs = []
+    implied_test_cases = {}
+    test_run_id = test_run_id or new_test_run_id()
+    
+    for index, event in enumerate(events):
+        try:
+            event_kind = event.get('kind')
+            if event_kind == 'TEST_RUN':
+                test_run_data, test_case_data = build_test_run_row(event)
+                test_run_data.update(test_run_id=test_run_id, customer_id=customer_id, source_system=source_system)
+                test_runs.append((index, test_run_data))
+                implied_test_cases.setdefault(test_case_data['test_case_id'], test_case_data)
+            elif event_kind in RESULT_EVENT_KINDS:
+                builder = RESULT_EVENT_KINDS[event_kind][0]
+                pending[event_kind].append((index, builder(event)))
+            else:
+                items[index] = {
+                    'status': 'failed',
+                    'error': f'Unknown event kind: {event_kind}'
+                }
+        except Exception as e:
+            items[index] = event_failed_item(event, str(e))
+    
+    # Resolve duplicates against the database and within the payload itself
+    for event_kind, rows in pending.items():
+        _, model, key_field, _, _, item_key, _, duplicate_error = RESULT_EVENT_KINDS[event_kind]
+        if not key_field or not rows:
+            continue
+        if event_kind == 'TRANSIT_METRIC':
+            # Stored dates are resolved by the ON CONFLICT insert below
+            existing = set()
+        else:
+            existing = db.get_existing_keys(getattr(model, key_field), [row[key_field] for _, row in rows])
+        unique_rows = []
+        for index, row in rows:
+            if row[key_field] in existing:
+                items[index] = {
+                    'status': 'duplicate',
+                    item_key: row[key_field],
+                    'error': duplicate_error
+                }
+            else:
+                existing.add(row[key_field])
+                unique_rows.append((index, row))
+        pending[event_kind] = unique_rows
+    
+    # Test runs have no natural key, so a re-sent execution is recognised by its content hash
+    if test_runs:
+        existing = db.get_existing_keys(TestRun.content_hash, [row['content_hash'] for _, row in test_runs])
+        unique_runs = []
+        for index, row in test_runs:
+            if row['content_hash'] in existing:
+                items[index] = {
+                    'status': 'duplicate',
+                    'runId': None,
+                    'testCaseId': events[index].get('testCase', {}).get('id'),
+                    'error': 'Test run already recorded'
+                }
+            else:
+                existing.add(row['content_hash'])
+                unique_runs.append((index, row))
+        test_runs = unique_runs
+    
+    # Test runs auto-create their test case unless it exists or is uploaded in this payload
+    if implied_test_cases:
+        known_test_cases = db.get_existing_keys(TestCase.test_case_id, list(implied_test_cases))
+        known_test_cases.update(row['test_case_id'] for _, row in pending['TEST_CASE'])
+        missing_test_cases = [row for test_case_id, row in implied_test_cases.items() if test_case_id not in known_test_cases]
+        db.bulk_insert(TestCase, missing_test_cases)
+    
+    for event_kind, rows in pending.items():
+        _, model, _, payload_key, payload_id, item_key, label, duplicate_error = RESULT_EVENT_KINDS[event_kind]
+        if event_kind == 'TRANSIT_METRIC':
+            statuses = db.upsert_transit_metrics([row for _, row in rows])
+        else:
+            statuses = ['accepted' if created else 'failed' for created in db.bulk_insert(model, [row for _, row in rows])]
+        for (index, _), status in zip(rows, statuses):
+            item_id = events[index].get(payload_key, {}).get(payload_id)
+            if status == 'accepted':
+                items[index] = {'status': 'accepted', item_key: item_id}
+            elif status == 'duplicate':
+                items[index] = {'status': 'duplicate', item_key: item_id, 'error': duplicate_error}
+            else:
+                items[index] = {'status': 'failed', item_key: item_id, 'error': f'Failed to create {label}'}
+    
+    # The pre-check above can't see a concurrent upload of the same run; ON CONFLICT can
+    statuses = db.insert_test_runs([row for _, row in test_runs])
+    for (index, test_run_data), status in zip(test_runs, statuses):
+        test_case_id = events[index].get('testCase', {}).get('id')
+        if status == 'accepted':
+            items[index] = {
                 'status': 'accepted',
+                'runId': test_run_data['run_id'],
                 'testCaseId': test_case_id
-            })
-            return {'success': True}
-        else:
-            items.append({
-                'status': 'failed',
-                'testCaseId': test_case_id,
-                'error': 'Failed to create test case'
-            })
-            return {'success': False}
-            
-    except Exception as e:
-        items.append({
-            'status': 'failed',
-            'testCaseId': event.get('testCase', {}).get('id'),
-            'error': str(e)
-        })
-        return {'success': False}
-
-def process_defect_event(event, items):
-    """Process defect event"""
-    try:
-        defect_data = event.get('defect', {})
-        defect_id = defect_data.get('id')
-        
-        # Check if defect already exists
-        existing_defect = db.get_defect_by_id(defect_id)
-        if existing_defect:
-            items.append({
+            }
+        elif status == 'duplicate':
+            items[index] = {
                 'status': 'duplicate',
-                'defectId': defect_id,
-                'error': 'Defect already exists'
-            })
-            return {'success': False, 'duplicate': True}
-        
-        # Create defect data
-        d_data = {
-            'defect_id': defect_id,
-            'title': defect_data.get('title'),
-            'severity': defect_data.get('severity'),
-            'status': defect_data.get('status', 'Open'),
-            'test_case_id': defect_data.get('testCaseId'),
-            'reported_by': defect_data.get('reportedBy'),
-            'created_at': datetime.datetime.now(),
-            'fixed_at': defect_data.get('fixedAt')
-        }
-        
-        if db.create_defect(d_data):
-            items.append({
-                'status': 'accepted',
-                'defectId': defect_id
-            })
-            return {'success': True}
+                'runId': None,
+                'testCaseId': test_case_id,
+                'error': 'Test run already recorded'
+            }
         else:
-            items.append({
+            items[index] = {
                 'status': 'failed',
-                'defectId': defect_id,
-                'error': 'Failed to create defect'
-            })
-            return {'success': False}
-            
-    except Exception as e:
-        items.append({
-            'status': 'failed',
-            'defectId': event.get('defect', {}).get('id'),
-            'error': str(e)
-        })
-        return {'success': False}
+                'runId': None,
+                'testCaseId': test_case_id,
+                'error': 'Failed to create test run'
+            }
+    
+    return {
+        'accepted': sum(1 for item in items if item['status'] == 'accepted'),
+        'duplicates': sum(1 for item in items if item['status'] == 'duplicate'),
+        'failed': sum(1 for item in items if item['status'] == 'failed'),
+        'items': items
+    }
 
-def process_test_type_summary_event(event, items):
-    """Process test type summary event"""
+def event_failed_item(event, error):
+    """Build the failed item for an event that could not be mapped to a row"""
     try:
-        summary_data = event.get('summary', {})
-        
-        # Create summary data
-        s_data = {
-            'test_type': summary_data.get('testType'),
-            'metrics': summary_data.get('metrics'),
-            'expected': summary_data.get('expected'),
-            'actual': summary_data.get('actual'),
-            'status': summary_data.get('status'),
-            'test_date': summary_data.get('testDate')
-        }
-        
-        if db.create_test_type_summary(s_data):
-            items.append({
-                'status': 'accepted',
-                'testType': summary_data.get('testType')
-            })
-            return {'success': True}
-        else:
-            items.append({
+        event_kind = event.get('kind')
+        if event_kind == 'TEST_RUN':
+            return {
                 'status': 'failed',
-                'testType': summary_data.get('testType'),
-                'error': 'Failed to create test type summary'
-            })
-            return {'success': False}
-            
-    except Exception as e:
-        items.append({
-            'status': 'failed',
-            'testType': event.get('summary', {}).get('testType'),
-            'error': str(e)
-        })
-        return {'success': False}
-
-def process_transit_metric_event(event, items):
-    """Process transit metric event"""
-    try:
-        metric_data = event.get('metric', {})
-        date = metric_data.get('date')
-        
-        # Check if metric for this date already exists
-        existing_metrics = db.get_all_transit_metrics()
-        existing_dates = [m.get('Date') for m in existing_metrics]
-        if date in existing_dates:
-            items.append({
-                'status': 'duplicate',
-                'date': date,
-                'error': 'Metric for this date already exists'
-            })
-            return {'success': False, 'duplicate': True}
-        
-        # Create metric data
-        m_data = {
-            'date': date,
-            'fvm_transactions': metric_data.get('fvmTransactions'),
-            'gate_taps': metric_data.get('gateTaps'),
-            'bus_taps': metric_data.get('busTaps'),
-            'success_rate_gate': metric_data.get('successRateGate'),
-            'success_rate_bus': metric_data.get('successRateBus'),
-            'avg_response_time': metric_data.get('avgResponseTime'),
-            'defect_count': metric_data.get('defectCount'),
-            'notes': metric_data.get('notes')
-        }
-        
-        if db.create_transit_metric(m_data):
-            items.append({
-                'status': 'accepted',
-                'date': date
-            })
-            return {'success': True}
-        else:
-            items.append({
+                'runId': None,
+                'testCaseId': event.get('testCase', {}).get('id'),
+                'error': error
+            }
+        if event_kind in RESULT_EVENT_KINDS:
+            _, _, _, payload_key, payload_id, item_key, _, _ = RESULT_EVENT_KINDS[event_kind]
+            return {
                 'status': 'failed',
-                'date': date,
-                'error': 'Failed to create transit metric'
-            })
-            return {'success': False}
-            
-    except Exception as e:
-        items.append({
-            'status': 'failed',
-            'date': event.get('metric', {}).get('date'),
-            'error': str(e)
-        })
-        return {'success': False}
+                item_key: event.get(payload_key, {}).get(payload_id),
+                'error': error
+            }
+    except Exception:
+        pass
+    return {'status': 'failed', 'error': error}
 
 # ============================================================================
 # TEST RESULTS API - BULK UPLOAD ENDPOINTS (INDIVIDUAL - KEPT FOR BACKWARD COMPATIBILITY)
@@ -2888,86 +3970,14 @@ def bulk_upload_test_runs():
         if not data.get('customerId') or not data.get('sourceSystem') or not data.get('events'):
             return jsonify({"error": "customerId, sourceSystem, and events are required"}), 400
         
-        customer_id = data['customerId']
-        source_system = data['sourceSystem']
+        try:
+            customer_id, source_system = get_ingest_source(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         events = data['events']
         
-        accepted = 0
-        duplicates = 0
-        failed = 0
-        items = []
-        
-        for event in events:
-            try:
-                if event.get('kind') != 'TEST_RUN':
-                    continue
-                
-                test_case = event.get('testCase', {})
-                test_case_id = test_case.get('id')
-                title = test_case.get('title')
-                component = test_case.get('component')
-                
-                # Generate unique run ID
-                run_id = str(uuid.uuid4())
-                
-                # Create test run data
-                test_run_data = {
-                    'run_id': run_id,
-                    'test_case_id': str(test_case_id),
-                    'execution_date': event.get('executionDate'),
-                    'result': event.get('result'),
-                    'observed_time': event.get('observedTimeMs'),
-                    'executed_by': event.get('executedBy'),
-                    'remarks': event.get('remarks')
-                }
-                
-                # Check if test case exists
-                existing_test_case = db.get_test_case_by_id(str(test_case_id))
-                if not existing_test_case:
-                    # Create test case if it doesn't exist
-                    test_case_data = {
-                        'test_case_id': str(test_case_id),
-                        'title': title,
-                        'component': component,
-                        'type': 'Automated',
-                        'status': 'Active',
-                        'created_by': event.get('executedBy', 'system'),
-                        'created_at': datetime.datetime.now()
-                    }
-                    db.create_test_case(test_case_data)
-                
-                # Create test run
-                if db.create_test_run(test_run_data):
-                    accepted += 1
-                    items.append({
-                        'status': 'accepted',
-                        'runId': run_id,
-                        'testCaseId': test_case_id
-                    })
-                else:
-                    failed += 1
-                    items.append({
-                        'status': 'failed',
-                        'runId': None,
-                        'testCaseId': test_case_id,
-                        'error': 'Failed to create test run'
-                    })
-                    
-            except Exception as e:
-                failed += 1
-                items.append({
-                    'status': 'failed',
-                    'runId': None,
-                    'testCaseId': event.get('testCase', {}).get('id'),
-                    'error': str(e)
-                })
-        
-        return jsonify({
-            'accepted': accepted,
-            'duplicates': duplicates,
-            'failed': failed,
-            'items': items
-        }), 200
+        test_run_events = [event for event in events if isinstance(event, dict) and event.get('kind') == 'TEST_RUN']
+        return jsonify(process_events(test_run_events, customer_id, source_system)), 200
         
     except Exception as e:
         print(f"Error in bulk upload test runs: {e}")
@@ -3320,76 +4330,14 @@ def bulk_upload_transit_metrics():
         if not data.get('customerId') or not data.get('sourceSystem') or not data.get('events'):
             return jsonify({"error": "customerId, sourceSystem, and events are required"}), 400
         
-        customer_id = data['customerId']
-        source_system = data['sourceSystem']
+        try:
+            customer_id, source_system = get_ingest_source(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         events = data['events']
         
-        accepted = 0
-        duplicates = 0
-        failed = 0
-        items = []
-        
-        for event in events:
-            try:
-                if event.get('kind') != 'TRANSIT_METRIC':
-                    continue
-                
-                metric_data = event.get('metric', {})
-                date = metric_data.get('date')
-                
-                # Check if metric for this date already exists
-                existing_metrics = db.get_all_transit_metrics()
-                existing_dates = [m.get('date') for m in existing_metrics]
-                if date in existing_dates:
-                    duplicates += 1
-                    items.append({
-                        'status': 'duplicate',
-                        'date': date,
-                        'error': 'Metric for this date already exists'
-                    })
-                    continue
-                
-                # Create metric data - using exact database column names
-                m_data = {
-                    'date': date,
-                    'fvm_transactions': metric_data.get('fvmTransactions'),
-                    'gate_taps': metric_data.get('gateTaps'),
-                    'bus_taps': metric_data.get('busTaps'),
-                    'success_rate_gate': metric_data.get('successRateGate'),
-                    'success_rate_bus': metric_data.get('successRateBus'),
-                    'avg_response_time': metric_data.get('avgResponseTime'),
-                    'defect_count': metric_data.get('defectCount'),
-                    'notes': metric_data.get('notes')
-                }
-                
-                if db.create_transit_metric(m_data):
-                    accepted += 1
-                    items.append({
-                        'status': 'accepted',
-                        'date': date
-                    })
-                else:
-                    failed += 1
-                    items.append({
-                        'status': 'failed',
-                        'date': date,
-                        'error': 'Failed to create transit metric'
-                    })
-                    
-            except Exception as e:
-                failed += 1
-                items.append({
-                    'status': 'failed',
-                    'date': event.get('metric', {}).get('date'),
-                    'error': str(e)
-                })
-        
-        return jsonify({
-            'accepted': accepted,
-            'duplicates': duplicates,
-            'failed': failed,
-            'items': items
-        }), 200
+        transit_events = [event for event in events if isinstance(event, dict) and event.get('kind') == 'TRANSIT_METRIC']
+        return jsonify(process_events(transit_events, customer_id, source_system)), 200
         
     except Exception as e:
         print(f"Error in bulk upload transit metrics: {e}")
@@ -3452,6 +4400,7 @@ def health_check_v1():
             "defects": "/api/v1/defects",
             "test_type_summary": "/api/v1/test-type-summary",
             "transit_metrics": "/api/v1/transit-metrics",
+            "export": "/api/v1/export/<entity>",
             "unified_bulk_upload": "/api/v1/results",
             "individual_bulk_upload": {
                 "test_runs": "/api/v1/results/test-runs",
@@ -3465,6 +4414,25 @@ def health_check_v1():
         }
     }), 200
 
+# ============================================================================
+# INTERNAL TELEMETRY
+# ============================================================================
+
+# Off by default: these endpoints are unauthenticated and expose deployment details
+INTERNAL_ENDPOINTS_ENABLED = os.getenv('INTERNAL_ENDPOINTS_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+
+@app.route('/api/v1/internal/pool', methods=['GET'])
+def pool_status_v1():
+    """Database connection pool configuration, occupancy and checkout latency"""
+    if not INTERNAL_ENDPOINTS_ENABLED:
+        return jsonify({"error": "Not found"}), 404
+    try:
+        return jsonify(get_pool_status()), 200
+    except Exception as e:
+        print(f"Error getting pool status: {e}")
+        traceback.print_exc()
+        return jsonify({"error": "Internal server error"}), 500
+
 if __name__ == '__main__':
     # Get port from environment variable (Render sets PORT)
     port = int(os.environ.get('PORT', 5000))
@@ -3472,4 +4440,9 @@ if __name__ == '__main__':
     host = '0.0.0.0' if os.environ.get('FLASK_ENV') == 'production' else '127.0.0.1'
     debug = os.environ.get('FLASK_ENV') != 'production'
     
+    # Process asynchronous /api/v1/results uploads in this process; WSGI deployments run ingest_worker.py
+    # instead. The reloader imports this module twice, so only its child process starts the worker.
+    if INGEST_WORKER_ENABLED and (not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+        start_ingest_worker()
+    
     app.run(host=host, port=port, debug=debug)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Background writer for asynchronous /api/v1/results?async=true uploads.
+Run one or more alongside the web processes (e.g. as a separate service):
+workers claim queued batches with SKIP LOCKED, so they never process the
+same batch at once. The development server (python dbapi.py) starts one
+in-process instead unless INGEST_WORKER_ENABLED=false.
+"""
+
+from dbapi import drain_ingest_spool, run_ingest_worker
+
+if __name__ == "__main__":
+    import sys
+
+    print("📥 Ingest Worker")
+    print("=" * 40)
+
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else "run"
+
+    if command == "run":
+        run_ingest_worker()
+    elif command == "drain":
+        processed = drain_ingest_spool()
+        print(f"✅ Processed {processed} queued batch(es)")
+    else:
+        print("Usage:")
+        print("  python ingest_worker.py         # Process uploads until stopped")
+        print("  python ingest_worker.py drain   # Process the queued uploads, then exit")
@@ -0,0 +1,38 @@
+"""Unique transit metric per date
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables created by create_db.py already carry the constraint
+    inspector = sa.inspect(op.get_bind())
+    existing = {c['name'] for c in inspector.get_unique_constraints('transit_metrics_daily')}
+    if 'uq_transit_metrics_daily_date' in existing:
+        return
+
+    # Keep the earliest row for any date that was ingested more than once
+    op.execute("""
+        DELETE FROM transit_metrics_daily a
+        USING transit_metrics_daily b
+        WHERE a.date = b.date AND a.id > b.id
+    """)
+    op.create_unique_constraint('uq_transit_metrics_daily_date', 'transit_metrics_daily', ['date'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_transit_metrics_daily_date', 'transit_metrics_daily', type_='unique')
@@ -0,0 +1,75 @@
+"""Typed date columns and indexes for hot query predicates
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing rows hold ISO strings plus the DD-MM-YYYY HH:MM format written by pscript.py. ISO strings with
+# a UTC offset are converted to naive UTC like parse_datetime does; a plain ::timestamp cast drops the offset
+EXECUTION_DATE_USING = r"""
+    CASE
+        WHEN execution_date IS NULL OR execution_date = '' THEN NULL
+        WHEN execution_date ~ '^\d{2}-\d{2}-\d{4} \d{2}:\d{2}:\d{2}$' THEN to_timestamp(execution_date, 'DD-MM-YYYY HH24:MI:SS')::timestamp
+        WHEN execution_date ~ '^\d{2}-\d{2}-\d{4} \d{2}:\d{2}$' THEN to_timestamp(execution_date, 'DD-MM-YYYY HH24:MI')::timestamp
+        WHEN execution_date ~ '^\d{2}-\d{2}-\d{4}$' THEN to_timestamp(execution_date, 'DD-MM-YYYY')::timestamp
+        WHEN execution_date ~ '\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}(:?\d{2})?)$' THEN (execution_date::timestamptz AT TIME ZONE 'UTC')
+        ELSE execution_date::timestamp
+    END
+"""
+
+INDEXES = [
+    ('ix_users_email', 'users', ['email']),
+    ('ix_test_cases_structured_requirement_id', 'test_cases_structured', ['requirement_id']),
+    ('ix_test_runs_test_run_id', 'test_runs', ['test_run_id']),
+    ('ix_test_runs_customer_id_execution_date', 'test_runs', ['customer_id', 'execution_date']),
+    ('ix_test_runs_execution_date_run_id', 'test_runs', ['execution_date', 'run_id']),
+    ('ix_test_type_summary_test_date_id', 'test_type_summary', ['test_date', 'id']),
+]
+
+
+def column_is_text(table, column):
+    inspector = sa.inspect(op.get_bind())
+    for col in inspector.get_columns(table):
+        if col['name'] == column:
+            return isinstance(col['type'], sa.String)
+    return False
+
+
+def upgrade() -> None:
+    if column_is_text('test_runs', 'execution_date'):
+        op.alter_column('test_runs', 'execution_date', type_=sa.DateTime(),
+                        postgresql_using=EXECUTION_DATE_USING)
+    if column_is_text('test_type_summary', 'test_date'):
+        op.alter_column('test_type_summary', 'test_date', type_=sa.Date(),
+                        postgresql_using="NULLIF(test_date, '')::date")
+    if column_is_text('transit_metrics_daily', 'date'):
+        op.alter_column('transit_metrics_daily', 'date', type_=sa.Date(),
+                        postgresql_using="date::date")
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+
+    op.alter_column('transit_metrics_daily', 'date', type_=sa.String(),
+                    postgresql_using="to_char(date, 'YYYY-MM-DD')")
+    op.alter_column('test_type_summary', 'test_date', type_=sa.String(),
+                    postgresql_using="to_char(test_date, 'YYYY-MM-DD')")
+    op.alter_column('test_runs', 'execution_date', type_=sa.String(),
+                    postgresql_using="to_char(execution_date, 'YYYY-MM-DD\"T\"HH24:MI:SS')")
@@ -0,0 +1,42 @@
+"""Ingest spool for asynchronous results uploads
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('ingest_batches'):
+        return
+    op.create_table(
+        'ingest_batches',
+        sa.Column('batch_id', sa.String(), primary_key=True),
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('source_system', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('result', sa.Text()),
+        sa.Column('error', sa.Text()),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('claimed_at', sa.DateTime()),
+        sa.Column('completed_at', sa.DateTime()),
+    )
+    op.create_index('ix_ingest_batches_status_created_at', 'ingest_batches', ['status', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ingest_batches_status_created_at', table_name='ingest_batches')
+    op.drop_table('ingest_batches')
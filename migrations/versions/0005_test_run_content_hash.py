@@ -0,0 +1,79 @@
+"""Content hash on test_runs for de-duplicating re-sent executions
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+import datetime
+import hashlib
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def content_hash(row) -> str:
+    """Frozen copy of database_postgresql.test_run_content_hash as of this revision.
+
+    execution_date is a timestamp column since 0002, so only datetimes need handling.
+    """
+    execution_date = row['execution_date']
+    if isinstance(execution_date, datetime.datetime) and execution_date.tzinfo is not None:
+        execution_date = execution_date.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    fields = [
+        str(row['test_case_id'] or '').strip(),
+        execution_date.isoformat() if execution_date else '',
+        str(row['executed_by'] or '').strip(),
+        str(row['result'] or '').strip().lower()
+    ]
+    return hashlib.sha256(json.dumps(fields).encode('utf-8')).hexdigest()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'content_hash' not in [col['name'] for col in inspector.get_columns('test_runs')]:
+        op.add_column('test_runs', sa.Column('content_hash', sa.String(64)))
+
+    # Hash existing rows in keyset-ordered batches, one executemany UPDATE per batch, so
+    # ingest also recognises older runs
+    test_runs = sa.table(
+        'test_runs',
+        sa.column('run_id', sa.String), sa.column('test_case_id', sa.String),
+        sa.column('execution_date', sa.DateTime), sa.column('executed_by', sa.String),
+        sa.column('result', sa.String), sa.column('content_hash', sa.String)
+    )
+    stmt = test_runs.update().where(test_runs.c.run_id == sa.bindparam('row_run_id')).values(
+        content_hash=sa.bindparam('content_hash')
+    )
+    last_run_id = ''
+    while True:
+        rows = bind.execute(
+            sa.select(test_runs.c.run_id, test_runs.c.test_case_id, test_runs.c.execution_date,
+                      test_runs.c.executed_by, test_runs.c.result)
+            .where(test_runs.c.content_hash.is_(None), test_runs.c.run_id > last_run_id)
+            .order_by(test_runs.c.run_id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).mappings().all()
+        if not rows:
+            break
+        bind.execute(stmt, [{'row_run_id': row['run_id'], 'content_hash': content_hash(row)} for row in rows])
+        last_run_id = rows[-1]['run_id']
+
+    op.create_index('ix_test_runs_content_hash', 'test_runs', ['content_hash'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_test_runs_content_hash', table_name='test_runs')
+    op.drop_column('test_runs', 'content_hash')
@@ -0,0 +1,26 @@
+"""Composite index for per-customer, per-source test run queries
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_test_runs_customer_source_execution_date', 'test_runs',
+                    ['customer_id', 'source_system', 'execution_date'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_test_runs_customer_source_execution_date', table_name='test_runs')
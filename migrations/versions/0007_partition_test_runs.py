@@ -0,0 +1,116 @@
+"""Range-partition test_runs by execution month
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+COLUMNS = """
+    run_id VARCHAR NOT NULL,
+    test_run_id VARCHAR NOT NULL,
+    customer_id INTEGER NOT NULL,
+    source_system VARCHAR NOT NULL,
+    test_case_id VARCHAR,
+    execution_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    result VARCHAR,
+    observed_time INTEGER,
+    executed_by VARCHAR,
+    remarks TEXT,
+    artifacts TEXT,
+    content_hash VARCHAR(64)
+"""
+
+COLUMN_NAMES = ("run_id, test_run_id, customer_id, source_system, test_case_id, execution_date, "
+                "result, observed_time, executed_by, remarks, artifacts, content_hash")
+
+INDEXES = [
+    ('ix_test_runs_test_run_id', ['test_run_id']),
+    ('ix_test_runs_content_hash', ['content_hash']),
+    ('ix_test_runs_customer_id_execution_date', ['customer_id', 'execution_date']),
+    ('ix_test_runs_customer_source_execution_date', ['customer_id', 'source_system', 'execution_date']),
+    ('ix_test_runs_execution_date_run_id', ['execution_date', 'run_id']),
+]
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def is_partitioned(bind):
+    return bind.execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('test_runs')"
+    )).first() is not None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or is_partitioned(bind):
+        return
+
+    missing_dates = bind.execute(sa.text("SELECT count(*) FROM test_runs WHERE execution_date IS NULL")).scalar()
+    if missing_dates:
+        raise RuntimeError(
+            f"{missing_dates} test_runs rows have no execution_date, which becomes the partition key; "
+            "set or delete them before running this migration"
+        )
+
+    # Move the old table aside, freeing its index and constraint names
+    op.execute("ALTER TABLE test_runs RENAME TO test_runs_unpartitioned")
+    op.execute("ALTER TABLE test_runs_unpartitioned DROP CONSTRAINT IF EXISTS test_runs_pkey")
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.execute(f"CREATE TABLE test_runs ({COLUMNS}, PRIMARY KEY (run_id, execution_date)) PARTITION BY RANGE (execution_date)")
+    op.execute("CREATE TABLE test_runs_default PARTITION OF test_runs DEFAULT")
+
+    first, last = bind.execute(sa.text("SELECT min(execution_date), max(execution_date) FROM test_runs_unpartitioned")).first()
+    current = datetime.date.today().replace(day=1)
+    month = first.date().replace(day=1) if first else current
+    end = max(last.date().replace(day=1) if last else current, add_months(current, MONTHS_AHEAD))
+    while month <= end:
+        op.execute(
+            f"CREATE TABLE test_runs_y{month.year:04d}m{month.month:02d} PARTITION OF test_runs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        )
+        month = add_months(month, 1)
+
+    for name, columns in INDEXES:
+        op.create_index(name, 'test_runs', columns)
+
+    op.execute(f"INSERT INTO test_runs ({COLUMN_NAMES}) SELECT {COLUMN_NAMES} FROM test_runs_unpartitioned")
+    op.execute("DROP TABLE test_runs_unpartitioned")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not is_partitioned(bind):
+        return
+
+    op.execute("ALTER TABLE test_runs RENAME TO test_runs_partitioned")
+    op.execute("ALTER TABLE test_runs_partitioned DROP CONSTRAINT IF EXISTS test_runs_pkey")
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.execute(f"CREATE TABLE test_runs ({COLUMNS}, PRIMARY KEY (run_id))")
+    for name, columns in INDEXES:
+        op.create_index(name, 'test_runs', columns)
+
+    op.execute(f"INSERT INTO test_runs ({COLUMN_NAMES}) SELECT {COLUMN_NAMES} FROM test_runs_partitioned")
+    # Dropping the parent drops all attached partitions with it
+    op.execute("DROP TABLE test_runs_partitioned")
@@ -0,0 +1,44 @@
+"""Daily pass-rate rollups per customer and test case
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('test_run_daily_rollups'):
+        return
+    op.create_table(
+        'test_run_daily_rollups',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('customer_id', sa.Integer(), primary_key=True),
+        sa.Column('test_case_id', sa.String(), primary_key=True),
+        sa.Column('component', sa.String()),
+        sa.Column('runs', sa.Integer(), nullable=False),
+        sa.Column('passes', sa.Integer(), nullable=False),
+        sa.Column('fails', sa.Integer(), nullable=False),
+        sa.Column('observed_time_p50', sa.Float()),
+        sa.Column('observed_time_p95', sa.Float()),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_test_run_daily_rollups_component_day', 'test_run_daily_rollups', ['component', 'day'])
+    op.create_index('ix_test_run_daily_rollups_customer_id_day', 'test_run_daily_rollups', ['customer_id', 'day'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_test_run_daily_rollups_customer_id_day', table_name='test_run_daily_rollups')
+    op.drop_index('ix_test_run_daily_rollups_component_day', table_name='test_run_daily_rollups')
+    op.drop_table('test_run_daily_rollups')
@@ -0,0 +1,28 @@
+"""Indexes behind the requirement traceability view
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_test_runs_test_case_id_execution_date', 'test_runs',
+                    ['test_case_id', 'execution_date'], if_not_exists=True)
+    op.create_index('ix_defects_test_case_id', 'defects', ['test_case_id'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_defects_test_case_id', table_name='defects')
+    op.drop_index('ix_test_runs_test_case_id_execution_date', table_name='test_runs')
@@ -0,0 +1,45 @@
+"""Cached flakiness stats per test case
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('test_case_flakiness'):
+        return
+    op.create_table(
+        'test_case_flakiness',
+        sa.Column('test_case_id', sa.String(), primary_key=True),
+        sa.Column('dirty_seq', sa.Integer(), nullable=False),
+        sa.Column('clean_seq', sa.Integer(), nullable=False),
+        sa.Column('runs', sa.Integer()),
+        sa.Column('flips', sa.Integer()),
+        sa.Column('flip_rate', sa.Float()),
+        sa.Column('last_n_runs', sa.Integer()),
+        sa.Column('last_n_passes', sa.Integer()),
+        sa.Column('streak_result', sa.String()),
+        sa.Column('streak_length', sa.Integer()),
+        sa.Column('last_run_at', sa.DateTime()),
+        sa.Column('refreshed_at', sa.DateTime()),
+    )
+    op.create_index('ix_test_case_flakiness_flip_rate', 'test_case_flakiness', ['flip_rate'])
+    # Existing test cases with runs are picked up by the first 'refresh_rollups.py flaky' run
+
+
+def downgrade() -> None:
+    op.drop_index('ix_test_case_flakiness_flip_rate', table_name='test_case_flakiness')
+    op.drop_table('test_case_flakiness')
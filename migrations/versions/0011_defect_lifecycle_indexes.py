@@ -0,0 +1,27 @@
+"""Indexes for the defect lifecycle report
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_defects_created_at', 'defects', ['created_at'], if_not_exists=True)
+    op.create_index('ix_defects_fixed_at', 'defects', ['fixed_at'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_defects_fixed_at', table_name='defects')
+    op.drop_index('ix_defects_created_at', table_name='defects')
@@ -0,0 +1,51 @@
+"""EWMA baselines and detected anomalies for daily transit metrics
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('transit_metric_baselines'):
+        op.create_table(
+            'transit_metric_baselines',
+            sa.Column('metric', sa.String(), primary_key=True),
+            sa.Column('samples', sa.Integer(), nullable=False),
+            sa.Column('mean', sa.Float()),
+            sa.Column('variance', sa.Float()),
+            sa.Column('last_date', sa.Date()),
+            sa.Column('updated_at', sa.DateTime()),
+        )
+    if not inspector.has_table('transit_metric_anomalies'):
+        op.create_table(
+            'transit_metric_anomalies',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('date', sa.Date(), nullable=False),
+            sa.Column('metric', sa.String(), nullable=False),
+            sa.Column('value', sa.Float(), nullable=False),
+            sa.Column('baseline', sa.Float(), nullable=False),
+            sa.Column('stddev', sa.Float(), nullable=False),
+            sa.Column('z_score', sa.Float(), nullable=False),
+            sa.Column('detected_at', sa.DateTime(), nullable=False),
+            sa.UniqueConstraint('date', 'metric', name='uq_transit_metric_anomalies_date_metric'),
+        )
+    # Existing history is folded in by the first transit ingest, or 'refresh_rollups.py anomalies'
+
+
+def downgrade() -> None:
+    op.drop_table('transit_metric_anomalies')
+    op.drop_table('transit_metric_baselines')
@@ -0,0 +1,127 @@
+"""Parsed numeric threshold and measurement columns on test_type_summary
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+import math
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of the parser in database_postgresql as of this revision, so later changes
+# to its units or pattern can't alter what this migration writes
+MEASUREMENT_PATTERN = re.compile(r'^\s*(<=|>=|==|<|>|=)?\s*([-+]?\d+(?:\.\d+)?)\s*([A-Za-z%]*)\s*$')
+
+MEASUREMENT_UNITS = {
+    '': ('', 1),
+    'us': ('ms', 0.001),
+    'ms': ('ms', 1),
+    's': ('ms', 1000),
+    'sec': ('ms', 1000),
+    'min': ('ms', 60000),
+    '%': ('%', 1),
+    'kb': ('GB', 1 / 1024 ** 2),
+    'mb': ('GB', 1 / 1024),
+    'gb': ('GB', 1),
+    'tb': ('GB', 1024),
+}
+
+COMPARATORS = {
+    '<': lambda actual, limit: actual < limit,
+    '<=': lambda actual, limit: actual <= limit,
+    '>': lambda actual, limit: actual > limit,
+    '>=': lambda actual, limit: actual >= limit,
+    '=': lambda actual, limit: math.isclose(actual, limit, rel_tol=1e-9, abs_tol=1e-9),
+    '==': lambda actual, limit: math.isclose(actual, limit, rel_tol=1e-9, abs_tol=1e-9),
+}
+
+
+def parse_measurement(text_value):
+    if text_value is None:
+        return None
+    match = MEASUREMENT_PATTERN.match(str(text_value))
+    if not match:
+        return None
+    comparator, number, unit = match.groups()
+    canonical = MEASUREMENT_UNITS.get(unit.lower(), (unit, 1))
+    return comparator, float(number) * canonical[1], canonical[0]
+
+
+def parse_summary_thresholds(row):
+    expected = parse_measurement(row['expected'])
+    actual = parse_measurement(row['actual'])
+    parsed = {}
+    parsed['expected_comparator'], parsed['expected_value'], parsed['expected_unit'] = expected or (None, None, None)
+    parsed['actual_value'], parsed['actual_unit'] = actual[1:] if actual else (None, None)
+    parsed['evaluated_status'] = None
+    if expected and actual and expected[0] and expected[2] == actual[2]:
+        parsed['evaluated_status'] = 'Pass' if COMPARATORS[expected[0]](actual[1], expected[1]) else 'Fail'
+    return parsed
+
+COLUMNS = [
+    sa.Column('expected_comparator', sa.String(2)),
+    sa.Column('expected_value', sa.Float()),
+    sa.Column('expected_unit', sa.String()),
+    sa.Column('actual_value', sa.Float()),
+    sa.Column('actual_unit', sa.String()),
+    sa.Column('evaluated_status', sa.String()),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = [col['name'] for col in sa.inspect(bind).get_columns('test_type_summary')]
+    for column in COLUMNS:
+        if column.name not in existing:
+            op.add_column('test_type_summary', sa.Column(column.name, column.type))
+
+    # Parse existing rows in id-ordered batches, one executemany UPDATE per batch
+    summaries = sa.table(
+        'test_type_summary',
+        sa.column('id', sa.Integer), sa.column('expected', sa.String), sa.column('actual', sa.String),
+        *[sa.column(column.name, column.type) for column in COLUMNS]
+    )
+    stmt = summaries.update().where(summaries.c.id == sa.bindparam('row_id')).values(
+        **{column.name: sa.bindparam(column.name) for column in COLUMNS}
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(summaries.c.id, summaries.c.expected, summaries.c.actual)
+            .where(summaries.c.id > last_id)
+            .order_by(summaries.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).mappings().all()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            parsed = parse_summary_thresholds(row)
+            params.append({'row_id': row['id'], **{column.name: parsed[column.name] for column in COLUMNS}})
+        bind.execute(stmt, params)
+        last_id = rows[-1]['id']
+
+    op.create_index('ix_test_type_summary_type_metrics_test_date', 'test_type_summary',
+                    ['test_type', 'metrics', 'test_date'], if_not_exists=True)
+    op.create_index('ix_test_type_summary_evaluated_status_test_date', 'test_type_summary',
+                    ['evaluated_status', 'test_date'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_test_type_summary_evaluated_status_test_date', table_name='test_type_summary')
+    op.drop_index('ix_test_type_summary_type_metrics_test_date', table_name='test_type_summary')
+    for column in reversed(COLUMNS):
+        op.drop_column('test_type_summary', column.name)
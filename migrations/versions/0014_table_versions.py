@@ -0,0 +1,40 @@
+"""Per-table change counters for conditional GET
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0014'
+down_revision: Union[str, None] = '0013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables served by collection endpoints; seeded so their first ETag has a Last-Modified
+VERSIONED_TABLES = ['requirements', 'test_cases_structured', 'test_runs', 'defects',
+                    'test_type_summary', 'transit_metrics_daily']
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('table_versions'):
+        return
+    table_versions = op.create_table(
+        'table_versions',
+        sa.Column('table_name', sa.String(), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    op.bulk_insert(table_versions, [{'table_name': name, 'version': 1, 'updated_at': now} for name in VERSIONED_TABLES])
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
@@ -0,0 +1,40 @@
+"""Unique (content_hash, execution_date) index on test_runs for ON CONFLICT de-duplication
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0015'
+down_revision: Union[str, None] = '0014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('test_runs')}
+    if 'uq_test_runs_content_hash_execution_date' in existing:
+        return
+
+    # Keep the earliest run of any execution that was recorded more than once
+    op.execute("""
+        DELETE FROM test_runs a
+        USING test_runs b
+        WHERE a.content_hash = b.content_hash AND a.execution_date = b.execution_date AND a.run_id > b.run_id
+    """)
+    # Includes execution_date because unique indexes on a partitioned table must contain the partition key
+    op.create_index('uq_test_runs_content_hash_execution_date', 'test_runs',
+                    ['content_hash', 'execution_date'], unique=True)
+    op.drop_index('ix_test_runs_content_hash', table_name='test_runs', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('ix_test_runs_content_hash', 'test_runs', ['content_hash'], if_not_exists=True)
+    op.drop_index('uq_test_runs_content_hash_execution_date', table_name='test_runs')
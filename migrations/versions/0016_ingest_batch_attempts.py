@@ -0,0 +1,30 @@
+"""Attempt counter on ingest_batches for fencing reclaimed batches
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0016'
+down_revision: Union[str, None] = '0015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if 'attempts' in [col['name'] for col in sa.inspect(op.get_bind()).get_columns('ingest_batches')]:
+        return
+    op.add_column('ingest_batches', sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'))
+    # A batch already being processed has been claimed once
+    op.execute("UPDATE ingest_batches SET attempts = 1 WHERE status = 'processing'")
+
+
+def downgrade() -> None:
+    op.drop_column('ingest_batches', 'attempts')
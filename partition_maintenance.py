@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Maintenance for the monthly partitions of the test_runs table.
+Run from cron (e.g. daily) to keep partitions ahead of incoming data; the API
+also creates them at startup. Rows for any other month (e.g. a backfill) land
+in test_runs_default; the 'default' command moves them into their own partitions.
+"""
+
+import datetime
+from database_postgresql import db, month_start, TEST_RUN_PARTITION_MONTHS_AHEAD
+
+def show_partitions():
+    """Show test_runs partitions with their bounds and estimated row counts"""
+    partitions = db.get_test_run_partitions()
+    if not partitions:
+        print("No partitions found (is test_runs partitioned?)")
+        return
+
+    print("\n📊 test_runs partitions:")
+    print("-" * 90)
+    for partition in partitions:
+        print(f"{partition['name']:25} | {partition['estimated_rows']:10} rows | {partition['bounds']}")
+
+def create_partitions(months_ahead):
+    """Create partitions from the current month through months_ahead"""
+    created = db.ensure_test_run_partitions(months_ahead=months_ahead)
+    if not db.test_runs_partitioned:
+        print("❌ test_runs is not a partitioned table - run the migrations first")
+        return False
+    print(f"✅ Created {created} partition(s), covering {months_ahead} month(s) ahead")
+    return True
+
+def split_default_partition():
+    """Create the partitions of the months found in test_runs_default, moving their rows out"""
+    months = db.get_default_partition_months()
+    created = db.ensure_test_run_partitions(months)
+    print(f"✅ Created {created} partition(s) for {len(months)} month(s) found in test_runs_default")
+    return created == len(months)
+
+def detach_partition(month):
+    """Detach one month's partition, leaving it as a standalone table"""
+    name = db.detach_test_run_partition(month)
+    if not name:
+        return False
+    print(f"✅ Detached {name}; it can now be archived or dropped")
+    return True
+
+if __name__ == "__main__":
+    import sys
+
+    print("🗓️  test_runs Partition Maintenance")
+    print("=" * 40)
+
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else "show"
+
+    if command in ("show", "list"):
+        show_partitions()
+    elif command == "create":
+        months_ahead = int(sys.argv[2]) if len(sys.argv) > 2 else TEST_RUN_PARTITION_MONTHS_AHEAD
+        create_partitions(months_ahead)
+        show_partitions()
+    elif command == "default":
+        split_default_partition()
+        show_partitions()
+    elif command == "detach" and len(sys.argv) > 2:
+        month = month_start(datetime.datetime.strptime(sys.argv[2], "%Y-%m").date())
+        detach_partition(month)
+    else:
+        print("Usage:")
+        print("  python partition_maintenance.py                    # Show partitions")
+        print("  python partition_maintenance.py create [months]    # Create partitions ahead")
+        print("  python partition_maintenance.py default            # Partition months stuck in test_runs_default")
+        print("  python partition_maintenance.py detach YYYY-MM     # Detach a month")
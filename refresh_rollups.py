@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Refresh the daily pass-rate rollups behind /api/v1/analytics/pass-rate.
+Run from cron (e.g. every 15 minutes); by default it rebuilds the last
+ROLLUP_REFRESH_DAYS days, which also picks up late-arriving runs.
+The 'flaky' command recomputes every cached flakiness row behind
+/api/v1/analytics/flaky; run it daily so old runs leave the lookback window.
+The 'anomalies' command rebuilds the transit anomaly baselines from the full
+history, e.g. after changing TRANSIT_ANOMALY_* settings. The 'summaries'
+command re-parses the expected/actual text of every test type summary into
+its numeric columns, e.g. after the parser learns a new unit.
+"""
+
+import datetime
+import os
+from database_postgresql import db, month_start, add_months
+
+ROLLUP_REFRESH_DAYS = int(os.getenv("ROLLUP_REFRESH_DAYS", 3))
+
+def refresh(day_from, day_to):
+    """Rebuild the rollups for an inclusive day range"""
+    written = db.refresh_pass_rate_rollups(day_from, day_to)
+    if written is None:
+        print(f"❌ Failed to refresh rollups for {day_from} .. {day_to}")
+        return False
+    print(f"✅ {day_from} .. {day_to}: {written} rollup rows")
+    return True
+
+def refresh_all():
+    """Rebuild the rollups for the whole test run history, one month per transaction"""
+    date_range = db.get_test_run_date_range()
+    if not date_range:
+        print("No test runs to roll up")
+        return True
+    first, last = date_range
+    month = month_start(first)
+    while month <= last:
+        if not refresh(month, add_months(month, 1) - datetime.timedelta(days=1)):
+            return False
+        month = add_months(month, 1)
+    return True
+
+def refresh_flaky():
+    """Recompute the flakiness stats of every test case"""
+    if not db.mark_all_flakiness_stale():
+        print("❌ Failed to mark flakiness stats for refresh")
+        return False
+    refreshed = db.refresh_flakiness()
+    print(f"✅ Recomputed flakiness for {refreshed} test case(s)")
+    return True
+
+def rebuild_anomalies():
+    """Recompute the transit baselines and anomalies from every stored day"""
+    found = db.update_transit_baselines(rebuild=True)
+    if found is None:
+        print("❌ Failed to rebuild transit anomaly baselines")
+        return False
+    print(f"✅ Rebuilt transit baselines, {found} anomalies found")
+    return True
+
+def reparse_summaries():
+    """Re-parse the thresholds and measurements of every test type summary"""
+    updated = db.reparse_test_type_summaries()
+    if updated is None:
+        print("❌ Failed to re-parse test type summaries")
+        return False
+    print(f"✅ Re-parsed {updated} test type summaries")
+    return True
+
+if __name__ == "__main__":
+    import sys
+
+    print("📈 Pass-rate Rollup Refresh")
+    print("=" * 40)
+
+    if len(sys.argv) == 1:
+        today = datetime.date.today()
+        refresh(today - datetime.timedelta(days=ROLLUP_REFRESH_DAYS - 1), today)
+    elif sys.argv[1].lower() == "all":
+        refresh_all()
+    elif sys.argv[1].lower() == "flaky":
+        refresh_flaky()
+    elif sys.argv[1].lower() == "anomalies":
+        rebuild_anomalies()
+    elif sys.argv[1].lower() == "summaries":
+        reparse_summaries()
+    elif len(sys.argv) == 3:
+        refresh(datetime.date.fromisoformat(sys.argv[1]), datetime.date.fromisoformat(sys.argv[2]))
+    else:
+        print("Usage:")
+        print("  python refresh_rollups.py                  # Rebuild the last ROLLUP_REFRESH_DAYS days")
+        print("  python refresh_rollups.py all              # Rebuild everything, month by month")
+        print("  python refresh_rollups.py FROM TO          # Rebuild a day range (YYYY-MM-DD)")
+        print("  python refresh_rollups.py flaky            # Recompute all flaky test stats")
+        print("  python refresh_rollups.py anomalies        # Rebuild transit anomaly baselines")
+        print("  python refresh_rollups.py summaries        # Re-parse test type summary values")
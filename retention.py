@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Retention job for the reporting database.
+Moves test runs and defects older than their retention window (RETENTION_DAYS_*)
+into gzipped NDJSON files under ARCHIVE_DIR, and restores archive files back.
+Safe to run from cron: it works in small batches and can be re-run after a failure.
+"""
+
+import glob
+import os
+from database_postgresql import db, RETENTION_DAYS, RETENTION_POLICIES, ARCHIVE_DIR
+
+def show_retention():
+    """Show each entity's retention window and how many rows are due for archival"""
+    print("\n📊 Retention status:")
+    print("-" * 70)
+    for entity in RETENTION_POLICIES:
+        cutoff = db.get_retention_cutoff(entity)
+        expired = db.count_expired_rows(entity)
+        print(f"{entity:12} | keep {RETENTION_DAYS[entity]:5} days | before {cutoff.date()} | {expired:8} rows due")
+
+def archive(entities):
+    """Archive expired rows of the given entities"""
+    for entity in entities:
+        summary = db.archive_expired_rows(entity)
+        print(f"✅ {entity}: archived {summary['archived']} rows older than {summary['cutoff']} into {len(summary['files'])} file(s)")
+        if summary.get('error'):
+            print(f"❌ {entity}: stopped early: {summary['error']}")
+            return False
+    return True
+
+def restore(paths):
+    """Restore archive files (or every archive file under a directory)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '**', '*.ndjson.gz'), recursive=True)))
+        else:
+            files.append(path)
+
+    for path in files:
+        summary = db.restore_archive(path)
+        if summary.get('error'):
+            print(f"❌ {path}: {summary['error']}")
+            continue
+        print(f"✅ {path}: restored {summary['restored']} {summary['entity']} rows, skipped {summary['skipped']}")
+
+if __name__ == "__main__":
+    import sys
+
+    print("🗄️  Reporting Database Retention")
+    print("=" * 40)
+
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else "show"
+
+    if command in ("show", "info"):
+        show_retention()
+    elif command == "archive":
+        entities = sys.argv[2:] or list(RETENTION_POLICIES)
+        unknown = [entity for entity in entities if entity not in RETENTION_POLICIES]
+        if unknown:
+            print(f"Unknown entities: {', '.join(unknown)} (choose from {', '.join(RETENTION_POLICIES)})")
+        else:
+            archive(entities)
+    elif command == "restore" and len(sys.argv) > 2:
+        restore(sys.argv[2:])
+    else:
+        print("Usage:")
+        print("  python retention.py                        # Show retention status")
+        print("  python retention.py archive [entity ...]   # Archive expired rows")
+        print(f"  python retention.py restore <file|dir> ... # Restore archives (e.g. {ARCHIVE_DIR}/defects)")
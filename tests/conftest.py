@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+# Tests marked postgres run against the PostgreSQL database in TEST_DATABASE_URL (its tables are
+# created if missing) and are skipped without one; the rest need no database at all
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "postgres: needs the PostgreSQL database in TEST_DATABASE_URL")
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DATABASE_URL:
+        return
+    skip = pytest.mark.skip(reason="set TEST_DATABASE_URL to a PostgreSQL database to run")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def database():
+    import database_postgresql
+    database_postgresql.Base.metadata.create_all(database_postgresql.get_engine())
+    return database_postgresql.db
@@ -0,0 +1,37 @@
+import dbapi
+
+VALID = {"kind": "TEST_RUN", "testCase": {"id": 42}, "executionDate": "2026-10-01T08:00:00Z", "result": "Pass"}
+
+
+def upload(monkeypatch, events):
+    queued = []
+    monkeypatch.setattr(dbapi.db, "enqueue_ingest_batch",
+                        lambda customer_id, source_system, events: queued.append(events) or "batch-1")
+    response = dbapi.app.test_client().post("/api/v1/results?async=true", json={
+        "customerId": 1, "sourceSystem": "ci", "events": events
+    })
+    return response, queued
+
+
+def test_valid_batch_is_queued(monkeypatch):
+    response, queued = upload(monkeypatch, [VALID, {"kind": "REQUIREMENT", "requirement": {"id": "REQ-1"}}])
+
+    assert response.status_code == 202
+    assert response.get_json()["batchId"] == "batch-1"
+    assert len(queued) == 1
+
+
+def test_batch_with_events_the_worker_would_reject_is_not_queued(monkeypatch):
+    undated = {"kind": "TEST_RUN", "testCase": {"id": 43}, "result": "Pass"}
+
+    response, queued = upload(monkeypatch, [VALID, undated, {"kind": "TEST_RESULT"}, "TEST_RUN"])
+
+    assert response.status_code == 400
+    assert not queued
+    body = response.get_json()
+    assert body["failed"] == 3
+    assert body["items"] == [
+        {"index": 1, "status": "failed", "runId": None, "testCaseId": 43, "error": "executionDate is required"},
+        {"index": 2, "status": "failed", "error": "Unknown event kind: TEST_RESULT"},
+        {"index": 3, "status": "failed", "error": "Event must be an object"},
+    ]
@@ -0,0 +1,59 @@
+import datetime
+
+import pytest
+
+import database_postgresql
+from database_postgresql import parse_datetime, parse_date, normalize_dates
+
+
+@pytest.mark.parametrize("value, parsed", [
+    ("2026-10-17T09:30:00", datetime.datetime(2026, 10, 17, 9, 30)),
+    ("2026-10-17T09:30:00Z", datetime.datetime(2026, 10, 17, 9, 30)),
+    # Offsets are converted to naive UTC, across a day boundary where needed
+    ("2026-10-17T09:30:00+02:00", datetime.datetime(2026, 10, 17, 7, 30)),
+    ("2026-10-17T01:00:00+05:30", datetime.datetime(2026, 10, 16, 19, 30)),
+    ("2026-10-17T20:00:00-05:00", datetime.datetime(2026, 10, 18, 1, 0)),
+    ("2026-10-17", datetime.datetime(2026, 10, 17)),
+    # Legacy DD-MM-YYYY formats written by pscript.py
+    ("17-10-2026 09:30", datetime.datetime(2026, 10, 17, 9, 30)),
+    ("17-10-2026 09:30:15", datetime.datetime(2026, 10, 17, 9, 30, 15)),
+    ("17-10-2026", datetime.datetime(2026, 10, 17)),
+    (datetime.datetime(2026, 10, 17, 9, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-2))),
+     datetime.datetime(2026, 10, 17, 11, 30)),
+    (datetime.date(2026, 10, 17), datetime.datetime(2026, 10, 17)),
+    (None, None),
+    ("", None),
+])
+def test_parse_datetime(value, parsed):
+    assert parse_datetime(value) == parsed
+
+
+@pytest.mark.parametrize("value", ["yesterday", "2026-13-01", "17/10/2026"])
+def test_parse_datetime_rejects_unrecognized_dates(value):
+    with pytest.raises(ValueError):
+        parse_datetime(value)
+
+
+def test_parse_date_uses_the_utc_day():
+    assert parse_date("2026-10-17T23:30:00-02:00") == datetime.date(2026, 10, 18)
+
+
+def test_normalize_dates_parses_the_model_date_columns_only():
+    run = {"run_id": "17-10-2026", "execution_date": "2026-10-17T09:30:00+02:00", "result": "Pass"}
+
+    normalized = normalize_dates(database_postgresql.TestRun, run)
+
+    assert normalized == {"run_id": "17-10-2026", "execution_date": datetime.datetime(2026, 10, 17, 7, 30), "result": "Pass"}
+    # The input is left as sent
+    assert run["execution_date"] == "2026-10-17T09:30:00+02:00"
+
+
+def test_normalize_dates_parses_date_columns_to_dates():
+    normalized = normalize_dates(database_postgresql.TestTypeSummary, {"test_date": "17-10-2026"})
+
+    assert normalized == {"test_date": datetime.date(2026, 10, 17)}
+
+
+def test_normalize_dates_raises_for_an_unparseable_date():
+    with pytest.raises(ValueError):
+        normalize_dates(database_postgresql.TestRun, {"execution_date": "soon"})
@@ -0,0 +1,135 @@
+import pytest
+
+import dbapi
+
+BODY = {"customerId": 1, "sourceSystem": "ci", "events": [{"kind": "TEST_RUN"}]}
+
+
+@pytest.fixture
+def keys(monkeypatch):
+    """The idempotency key table and the upload handler, faked in memory"""
+    state = {"stored": {}, "processed": 0}
+
+    def claim_idempotency_key(key, endpoint, request_hash):
+        if (key, endpoint) in state["stored"]:
+            return False
+        state["stored"][(key, endpoint)] = {"request_hash": request_hash, "status_code": None, "response": None}
+        return True
+
+    def get_idempotent_response(key, endpoint):
+        return state["stored"].get((key, endpoint))
+
+    def store_idempotent_response(key, endpoint, status_code, response):
+        state["stored"][(key, endpoint)].update(status_code=status_code, response=response)
+
+    def process_events(events, customer_id, source_system):
+        state["processed"] += 1
+        return {"accepted": len(events), "duplicates": 0, "failed": 0, "run": state["processed"]}
+
+    monkeypatch.setattr(dbapi.db, "claim_idempotency_key", claim_idempotency_key)
+    monkeypatch.setattr(dbapi.db, "get_idempotent_response", get_idempotent_response)
+    monkeypatch.setattr(dbapi.db, "store_idempotent_response", store_idempotent_response)
+    monkeypatch.setattr(dbapi, "process_events", process_events)
+    return state
+
+
+def post(client, key, body=BODY):
+    return client.post("/api/v1/results", json=body, headers={"Idempotency-Key": key})
+
+
+def test_retry_replays_the_stored_response(keys):
+    client = dbapi.app.test_client()
+
+    first = post(client, "upload-1")
+    retry = post(client, "upload-1")
+
+    assert first.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.get_json() == first.get_json()
+    assert keys["processed"] == 1
+
+
+def test_requests_without_a_key_always_run(keys):
+    client = dbapi.app.test_client()
+
+    client.post("/api/v1/results", json=BODY)
+    client.post("/api/v1/results", json=BODY)
+
+    assert keys["processed"] == 2
+    assert not keys["stored"]
+
+
+def test_key_reused_with_a_different_body_is_rejected(keys):
+    client = dbapi.app.test_client()
+    post(client, "upload-1")
+
+    reused = post(client, "upload-1", dict(BODY, sourceSystem="nightly"))
+
+    assert reused.status_code == 422
+    assert keys["processed"] == 1
+
+
+def test_key_still_being_processed_is_a_conflict(keys):
+    client = dbapi.app.test_client()
+    # Claimed by a request that has not committed its response yet
+    keys["stored"][("upload-1", "/api/v1/results")] = {"request_hash": "", "status_code": None, "response": None}
+
+    response = post(client, "upload-1")
+
+    assert response.status_code == 409
+    assert keys["processed"] == 0
+
+
+def test_server_errors_are_not_stored(keys, monkeypatch):
+    def process_events(events, customer_id, source_system):
+        raise RuntimeError("connection refused")
+
+    monkeypatch.setattr(dbapi, "process_events", process_events)
+    client = dbapi.app.test_client()
+
+    response = post(client, "upload-1")
+
+    assert response.status_code == 500
+    assert keys["stored"][("upload-1", "/api/v1/results")]["response"] is None
+
+
+def test_overlong_key_is_rejected(keys):
+    response = post(dbapi.app.test_client(), "k" * 256)
+
+    assert response.status_code == 400
+    assert not keys["stored"]
+
+
+def test_key_that_cannot_be_claimed_is_a_server_error(keys, monkeypatch):
+    # claim_idempotency_key logs database errors and returns None
+    monkeypatch.setattr(dbapi.db, "claim_idempotency_key", lambda key, endpoint, request_hash: None)
+
+    response = post(dbapi.app.test_client(), "upload-1")
+
+    assert response.status_code == 500
+    assert keys["processed"] == 0
+
+
+def test_claim_returns_none_when_the_database_fails(monkeypatch):
+    class BrokenSession:
+        rolled_back = closed = False
+
+        def add(self, record):
+            pass
+
+        def commit(self):
+            raise RuntimeError("server closed the connection unexpectedly")
+
+        def rollback(self):
+            self.rolled_back = True
+
+        def close(self):
+            self.closed = True
+
+    session = BrokenSession()
+    monkeypatch.setattr(dbapi.db, "get_session", lambda: session)
+
+    assert dbapi.db.claim_idempotency_key("upload-1", "/api/v1/results", "hash") is None
+    assert session.rolled_back and session.closed
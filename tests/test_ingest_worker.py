@@ -0,0 +1,58 @@
+import datetime
+import uuid
+
+import pytest
+
+import database_postgresql
+import dbapi
+from database_postgresql import IngestBatch
+
+pytestmark = pytest.mark.postgres
+
+EVENTS = [{
+    "kind": "TEST_RUN",
+    "testCase": {"id": 42, "title": "Gate opens on valid card"},
+    "executionDate": "2026-10-01T08:00:00Z",
+    "result": "Pass",
+}]
+
+
+def test_async_upload_is_queued_in_the_request_transaction(database):
+    client = dbapi.app.test_client()
+    dbapi.ingest_worker_wakeup.clear()
+    body = {"customerId": 1, "sourceSystem": "ci", "events": EVENTS}
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    first = client.post("/api/v1/results?async=true", json=body, headers=headers)
+    retry = client.post("/api/v1/results?async=true", json=body, headers=headers)
+
+    assert first.status_code == 202
+    assert dbapi.ingest_worker_wakeup.is_set()
+    assert retry.status_code == 202
+    assert retry.headers.get("Idempotent-Replayed") == "true"
+    assert retry.get_json()["batchId"] == first.get_json()["batchId"]
+
+    assert dbapi.drain_ingest_spool() >= 1
+    assert database.get_ingest_batch(first.get_json()["batchId"])["status"] == "completed"
+
+
+def test_reclaimed_batch_cannot_be_finished_by_its_previous_claim(database):
+    dbapi.drain_ingest_spool()
+    batch_id = database.enqueue_ingest_batch(1, "ci", EVENTS)
+    first = database.claim_ingest_batch()
+    assert first["batch_id"] == batch_id
+
+    # The first worker overruns INGEST_CLAIM_TIMEOUT and another worker takes the batch over
+    session = database_postgresql.get_session_local()()
+    session.query(IngestBatch).filter_by(batch_id=batch_id).update(
+        {"claimed_at": datetime.datetime.now() - datetime.timedelta(days=1)}
+    )
+    session.commit()
+    session.close()
+    second = database.claim_ingest_batch()
+
+    assert second["batch_id"] == batch_id
+    assert second["attempt"] == first["attempt"] + 1
+    assert not database.finish_ingest_batch(batch_id, first["attempt"], result={"accepted": 0})
+    assert database.finish_ingest_batch(batch_id, second["attempt"], result={"accepted": 1})
+    assert database.get_ingest_batch(batch_id)["result"] == {"accepted": 1}
@@ -0,0 +1,47 @@
+import datetime
+
+import pytest
+
+import database_postgresql
+from database_postgresql import encode_cursor, decode_cursor, Requirement
+
+# Test-prefixed model names would be collected as test classes if imported directly
+summaries = database_postgresql.TestTypeSummary
+test_runs = database_postgresql.TestRun
+
+
+def test_datetime_cursor_round_trips():
+    created_at = datetime.datetime(2026, 10, 17, 9, 30, 15, 123456)
+
+    cursor = encode_cursor(created_at, "REQ-7")
+
+    assert decode_cursor(cursor, Requirement.created_at, Requirement.requirement_id) == (created_at, "REQ-7")
+
+
+def test_date_cursor_round_trips_with_integer_key():
+    cursor = encode_cursor(datetime.date(2026, 10, 17), 42)
+
+    assert decode_cursor(cursor, summaries.test_date, summaries.id) == (datetime.date(2026, 10, 17), 42)
+
+
+def test_null_sort_value_round_trips():
+    cursor = encode_cursor(None, 42)
+
+    assert decode_cursor(cursor, summaries.test_date, summaries.id) == (None, 42)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor("??>>??", "~~~")
+
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    encode_cursor("yesterday", "REQ-7"),
+    encode_cursor("2026-10-17", "not a number"),
+    "WzFd",  # a JSON list of the wrong length
+])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, test_runs.execution_date, summaries.id)
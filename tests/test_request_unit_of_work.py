@@ -0,0 +1,16 @@
+import dbapi
+
+
+def test_failed_commit_returns_json_500(monkeypatch):
+    def fail_commit():
+        raise RuntimeError("could not serialize access due to concurrent update")
+
+    monkeypatch.setattr(dbapi.db, "commit_unit_of_work", fail_commit)
+    client = dbapi.app.test_client()
+
+    response = client.get("/api/health", headers={"Origin": "http://localhost:3000"})
+
+    assert response.status_code == 500
+    assert response.is_json
+    assert response.get_json() == {"error": "Internal server error"}
+    assert response.headers.get("Access-Control-Allow-Origin")
@@ -0,0 +1,136 @@
+import datetime
+
+import pytest
+
+import dbapi
+from dbapi import ResponseCache
+
+
+def cache_key(path, versions=(1,)):
+    with dbapi.app.test_request_context(path):
+        return ResponseCache(30, 1024).key(versions)
+
+
+def test_key_includes_query_string_and_table_versions():
+    assert cache_key("/api/requirements?b=2&a=1") == cache_key("/api/requirements?a=1&b=2")
+    assert cache_key("/api/requirements?a=1") != cache_key("/api/requirements?a=2")
+    assert cache_key("/api/requirements", (1,)) != cache_key("/api/requirements", (2,))
+
+
+def test_least_recently_used_entries_are_evicted_past_max_bytes():
+    cache = ResponseCache(ttl=30, max_bytes=10)
+    cache.put("a", {"requirements"}, b"aaaa", 200, "application/json")
+    cache.put("b", {"requirements"}, b"bbbb", 200, "application/json")
+    assert cache.get("a") is not None
+
+    cache.put("c", {"requirements"}, b"cccc", 200, "application/json")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.size == 8
+
+
+def test_bodies_larger_than_the_cache_are_not_stored():
+    cache = ResponseCache(ttl=30, max_bytes=3)
+
+    cache.put("a", {"requirements"}, b"aaaa", 200, "application/json")
+
+    assert cache.get("a") is None
+    assert cache.size == 0
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(dbapi.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(ttl=30, max_bytes=100)
+    cache.put("a", {"requirements"}, b"aaaa", 200, "application/json")
+
+    now[0] += 29
+    assert cache.get("a") is not None
+    now[0] += 1
+    assert cache.get("a") is None
+    assert cache.size == 0
+
+
+def test_invalidate_drops_entries_built_from_the_written_tables():
+    cache = ResponseCache(ttl=30, max_bytes=100)
+    cache.put("requirements", {"requirements"}, b"r", 200, "application/json")
+    cache.put("traceability", {"requirements", "test_runs"}, b"t", 200, "application/json")
+    cache.put("defects", {"defects"}, b"d", 200, "application/json")
+
+    cache.invalidate({"test_runs"})
+
+    assert [key for key in cache.entries] == ["requirements", "defects"]
+    assert cache.size == 2
+
+
+@pytest.fixture
+def requirements(monkeypatch):
+    """GET /api/requirements against fake table versions, counting how often the rows are read"""
+    state = {"version": 1, "updated_at": datetime.datetime(2026, 10, 17, 9, 30, 15, 500000), "reads": 0}
+
+    def get_table_versions(tables):
+        return {"versions": (state["version"],), "updated_at": state["updated_at"]}
+
+    def get_all_requirements():
+        state["reads"] += 1
+        return [{"requirement_id": "REQ-1", "version": state["version"]}]
+
+    monkeypatch.setattr(dbapi.db, "get_table_versions", get_table_versions)
+    monkeypatch.setattr(dbapi, "get_all_requirements", get_all_requirements)
+    monkeypatch.setattr(dbapi.response_cache, "ttl", 30)
+    dbapi.response_cache.clear()
+    yield state
+    dbapi.response_cache.clear()
+
+
+def test_repeated_get_is_served_from_the_cache(requirements):
+    client = dbapi.app.test_client()
+
+    first = client.get("/api/requirements")
+    second = client.get("/api/requirements")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_json() == first.get_json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert requirements["reads"] == 1
+
+
+def test_matching_etag_or_last_modified_is_not_modified(requirements):
+    client = dbapi.app.test_client()
+    first = client.get("/api/requirements")
+
+    by_etag = client.get("/api/requirements", headers={"If-None-Match": first.headers["ETag"]})
+    by_date = client.get("/api/requirements", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+
+    assert by_etag.status_code == 304
+    assert by_date.status_code == 304
+    assert by_etag.headers["ETag"] == first.headers["ETag"]
+    assert requirements["reads"] == 1
+
+
+def test_a_write_changes_the_etag_and_misses_the_cache(requirements):
+    client = dbapi.app.test_client()
+    first = client.get("/api/requirements")
+
+    requirements["version"] += 1
+    requirements["updated_at"] += datetime.timedelta(minutes=1)
+    after_write = client.get("/api/requirements", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert after_write.status_code == 200
+    assert after_write.headers["X-Cache"] == "MISS"
+    assert after_write.headers["ETag"] != first.headers["ETag"]
+    assert after_write.get_json() == [{"requirement_id": "REQ-1", "version": 2}]
+
+
+def test_failed_responses_are_not_cached(requirements, monkeypatch):
+    def fail():
+        raise RuntimeError("connection refused")
+
+    monkeypatch.setattr(dbapi, "get_all_requirements", fail)
+    client = dbapi.app.test_client()
+
+    assert client.get("/api/requirements").status_code == 500
+    assert not dbapi.response_cache.entries
@@ -0,0 +1,65 @@
+import pytest
+
+from database_postgresql import parse_measurement, parse_summary_thresholds
+
+
+@pytest.mark.parametrize("text_value, parsed", [
+    ("<=250ms", ("<=", 250.0, "ms")),
+    ("98.50%", (None, 98.5, "%")),
+    ("1.2GB", (None, 1.2, "GB")),
+    (">=99.50%", (">=", 99.5, "%")),
+    ("3.2s", (None, 3200.0, "ms")),
+    ("512 MB", (None, 0.5, "GB")),
+    ("  < 500 ms ", ("<", 500.0, "ms")),
+    ("42", (None, 42.0, "")),
+    ("10 req", (None, 10.0, "req")),
+    ("fast", None),
+    ("250ms-300ms", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_measurement(text_value, parsed):
+    assert parse_measurement(text_value) == parsed
+
+
+@pytest.mark.parametrize("expected, actual, evaluated_status", [
+    ("<=250ms", "180ms", "Pass"),
+    ("<=250ms", "250ms", "Pass"),
+    ("<500ms", "3.2s", "Fail"),
+    (">=99.50%", "98.50%", "Fail"),
+    (">=99.50%", "99.9%", "Pass"),
+    ("=1.2GB", "1228.8MB", "Pass"),
+    # Mismatched units are not compared
+    ("<=250ms", "98.50%", None),
+    ("<=10 req", "3 rps", None),
+    # Without a comparator there is nothing to evaluate
+    ("98.50%", "99.00%", None),
+    # Unparseable text on either side
+    ("<=250ms", "n/a", None),
+    ("fast enough", "180ms", None),
+])
+def test_parse_summary_thresholds_evaluates_actual_against_expected(expected, actual, evaluated_status):
+    parsed = parse_summary_thresholds({"expected": expected, "actual": actual, "status": "Pass"})
+
+    assert parsed["evaluated_status"] == evaluated_status
+    # The reported status is kept as sent
+    assert parsed["status"] == "Pass"
+
+
+def test_parse_summary_thresholds_fills_numeric_columns():
+    parsed = parse_summary_thresholds({"expected": "<500ms", "actual": "3.2s"})
+
+    assert parsed["expected_comparator"] == "<"
+    assert parsed["expected_value"] == 500.0
+    assert parsed["expected_unit"] == "ms"
+    assert parsed["actual_value"] == 3200.0
+    assert parsed["actual_unit"] == "ms"
+
+
+def test_parse_summary_thresholds_leaves_unparsed_columns_empty():
+    parsed = parse_summary_thresholds({"expected": None, "actual": "n/a"})
+
+    assert parsed["expected_comparator"] is None
+    assert parsed["expected_value"] is None
+    assert parsed["actual_value"] is None
+    assert parsed["evaluated_status"] is None
@@ -0,0 +1,77 @@
+import uuid
+
+import pytest
+
+import database_postgresql
+
+
+def test_content_hash_ignores_run_id_date_format_and_casing():
+    sent = {"run_id": "a", "test_case_id": "42", "execution_date": "2026-10-01T10:00:00+02:00",
+            "executed_by": "ci", "result": "Pass"}
+    resent = {"run_id": "b", "test_case_id": " 42 ", "execution_date": "2026-10-01T08:00:00Z",
+              "executed_by": "ci", "result": "PASS"}
+
+    content_hash = database_postgresql.test_run_content_hash
+
+    assert content_hash(sent) == content_hash(resent)
+    assert content_hash(sent) != content_hash(dict(sent, result="Fail"))
+    assert content_hash(sent) != content_hash(dict(sent, execution_date="2026-10-02T10:00:00+02:00"))
+
+
+def test_test_run_event_without_execution_date_is_rejected():
+    import dbapi
+
+    response = dbapi.process_events([{"kind": "TEST_RUN", "testCase": {"id": 42}, "result": "Pass"}], 1, "ci")
+
+    assert response["accepted"] == 0
+    assert response["failed"] == 1
+    assert response["items"][0]["error"] == "executionDate is required"
+
+
+def run_event(test_case_id, **overrides):
+    event = {
+        "kind": "TEST_RUN",
+        "testCase": {"id": test_case_id, "title": "Gate opens on valid card", "component": "gates"},
+        "executionDate": "2026-10-01T08:00:00Z",
+        "executedBy": "ci",
+        "result": "Pass",
+    }
+    event.update(overrides)
+    return event
+
+
+@pytest.mark.postgres
+def test_resent_run_is_reported_as_duplicate(database):
+    import dbapi
+
+    client = dbapi.app.test_client()
+    test_case_id = uuid.uuid4().int % 10 ** 9
+    first = client.post("/api/v1/results", json={
+        "customerId": 1, "sourceSystem": "ci", "events": [run_event(test_case_id)]
+    })
+    # Another pipeline re-sends the same execution with its own formatting
+    resent = client.post("/api/v1/results", json={
+        "customerId": 1, "sourceSystem": "nightly",
+        "events": [run_event(test_case_id, executionDate="2026-10-01T10:00:00+02:00", result="PASS")]
+    })
+
+    assert first.get_json()["accepted"] == 1
+    assert resent.get_json()["accepted"] == 0
+    assert resent.get_json()["duplicates"] == 1
+    assert len(database.find_test_runs(test_case_id=str(test_case_id))) == 1
+
+
+@pytest.mark.postgres
+def test_insert_skips_runs_already_stored(database):
+    test_case_id = str(uuid.uuid4())
+    run = {"test_run_id": "TR-1", "customer_id": 1, "source_system": "ci", "test_case_id": test_case_id,
+           "execution_date": "2026-10-01T08:00:00", "executed_by": "ci", "result": "Pass"}
+
+    # No existence check first: the unique (content_hash, execution_date) index catches the re-send
+    assert database.insert_test_runs([dict(run, run_id=str(uuid.uuid4()))]) == ["accepted"]
+    assert database.insert_test_runs([dict(run, run_id=str(uuid.uuid4())),
+                                      dict(run, run_id=str(uuid.uuid4()), result="Fail")]) == ["duplicate", "accepted"]
+
+    session = database.get_session()
+    assert session.query(database_postgresql.TestRun).filter_by(test_case_id=test_case_id).count() == 2
+    session.close()